@@ -0,0 +1,103 @@
+'''
+    API Response Cache
+
+    2017 Jacob Grishey
+
+    For the purpose of keeping raw API responses on disk,
+    so scraped data can be parsed again without the network.
+'''
+
+# IMPORTS
+
+import json
+import time
+import hashlib
+import datetime
+from pathlib import Path
+from atomicfile import writeFile
+
+# Freshness
+#
+# A response fetched at least SETTLED_DAYS after the last date it covers is kept
+# for good: those games are final. Any other response, recent or still to be
+# played, is refetched once older than TTL seconds.
+
+SETTLED_DAYS = 2
+TTL = 900
+
+class CacheMiss (Exception):
+    pass
+
+# Response Cache
+#
+# Bodies are stored once under objects/, named by their SHA-256. Each request,
+# by its URL, has an entry under entries/ naming the body it got and when.
+# Files are written whole and renamed into place, so concurrent fetches and
+# interrupted runs never leave a partial file behind.
+
+class ResponseCache:
+    def __init__ (self, directory, ttl=TTL, settledDays=SETTLED_DAYS, offline=False):
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.settledDays = settledDays
+        self.offline = offline
+
+    def entryPath (self, url):
+        return self.directory / "entries" / (hashlib.sha256(url.encode()).hexdigest() + ".json")
+
+    def objectPath (self, digest):
+        return self.directory / "objects" / digest[:2] / digest
+
+    # Fresh Function
+    #
+    # Whether a cached entry for a request covering dates up to lastDate can
+    # still be used at time now.
+
+    def fresh (self, entry, lastDate, now):
+        fetchedDate = datetime.date.fromtimestamp(entry['fetched'])
+        if (fetchedDate - datetime.date.fromisoformat(lastDate)).days >= self.settledDays:
+            return True
+        return now - entry['fetched'] < self.ttl
+
+    # Read Function
+    #
+    # Return the cached body for url, or None if there is none or it is damaged.
+
+    def read (self, url):
+        try:
+            with open(self.entryPath(url)) as entryFile:
+                entry = json.load(entryFile)
+            body = self.objectPath(entry['object']).read_bytes()
+        except (OSError, ValueError, KeyError):
+            return None, None
+        if hashlib.sha256(body).hexdigest() != entry['object']:
+            return None, None
+        return entry, body
+
+    def write (self, url, body):
+        digest = hashlib.sha256(body).hexdigest()
+        objectPath = self.objectPath(digest)
+        if not objectPath.is_file():
+            writeFile(objectPath, body)
+        entry = {'url': url, 'object': digest, 'fetched': time.time()}
+        writeFile(self.entryPath(url), json.dumps(entry))
+
+    # Get Function
+    #
+    # Return the parsed JSON response to url, covering dates up to lastDate,
+    # from the cache if fresh, otherwise from download() and stored once it
+    # parses. Offline, any cached response is used and a missing one raises
+    # CacheMiss.
+
+    def get (self, url, lastDate, download):
+        entry, body = self.read(url)
+
+        if body is not None and (self.offline or self.fresh(entry, lastDate, time.time())):
+            return json.loads(body.decode())
+        if self.offline:
+            raise CacheMiss(url)
+
+        body = download()
+        data = json.loads(body.decode())
+        self.write(url, body)
+        return data
@@ -0,0 +1,39 @@
+'''
+    Atomic File Writes
+
+    2017 Jacob Grishey
+
+    For the purpose of replacing files on disk only once
+    their new contents are complete, so readers and other
+    writers never see a half-written file.
+'''
+
+# IMPORTS
+
+import os
+import threading
+from pathlib import Path
+
+# Write File Function
+#
+# Write data, bytes or text, to a temporary file next to path, then rename it
+# into place. The temporary name is unique to the process and thread, so
+# concurrent writers to the same path never share one; the last rename wins.
+
+def writeFile (path, data):
+    path = Path(path)
+    if isinstance(data, str):
+        data = data.encode()
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name("{0}.{1}.{2}.tmp".format(path.name, os.getpid(), threading.get_ident()))
+    try:
+        with open(temporary, "wb") as outFile:
+            outFile.write(data)
+        os.replace(temporary, path)
+    except BaseException:
+        try:
+            temporary.unlink()
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,117 @@
+'''
+    Elo Backtest
+
+    2017 Jacob Grishey
+
+    For the purpose of replaying every season on file in
+    one pass, carrying ratings from one season to the next.
+'''
+
+# IMPORTS
+
+import json
+import time
+import hashlib
+import argparse
+from pathlib import Path
+from collections import namedtuple
+import projection
+from gametable import GameTable
+from season import CACHE_DIR, loadCompiled
+from atomicfile import writeFile
+from teams import TEAMS
+
+DATA_DIR = "./../data"
+
+# Bump when the Elo model changes, so cached ratings are recomputed.
+
+RATINGS_VERSION = 2
+
+# Season Names Function
+#
+# Seasons with a season file in dataDir, oldest first, like "2013-14".
+
+def seasonNames (dataDir=DATA_DIR):
+    return sorted(path.stem[len("season"):] for path in Path(dataDir).glob("season*.json"))
+
+# Final Ratings Function
+#
+# Given a season and the ratings it started from, replay all of its games and
+# return the final Elo of every team that played.
+
+def finalRatings (season, priorRatings=None):
+    games = season if isinstance(season, GameTable) else GameTable(season)
+    state = projection.prepare(games, priorRatings)
+    return {TEAMS[team]: float(state.table.elo[team]) for team in range(len(TEAMS)) if len(games.schedules[team])}
+
+# Season Ratings
+#
+# One season of a backtest: the ratings it started from, its final ratings and
+# whether they came from the cache.
+
+SeasonRatings = namedtuple('SeasonRatings', ['season', 'start', 'final', 'cached'])
+
+# Backtest Function
+#
+# Replay the given seasons in order, or every season on file, starting the
+# first from 1500 and every other from the previous one's final ratings
+# regressed to the mean. Teams new to the league start at 1500. A season's
+# final ratings are cached under cacheDir and reused while its file, its
+# starting ratings, the Elo constants and RATINGS_VERSION are unchanged.
+
+def backtest (seasons=None, dataDir=DATA_DIR, cacheDir=CACHE_DIR):
+    results = []
+    start = None
+
+    for name in seasons or seasonNames(dataDir):
+        path = Path(dataDir) / ("season" + name + ".json")
+
+        key = hashlib.sha256(path.read_bytes())
+        key.update(json.dumps([RATINGS_VERSION, projection.K_FACTOR, projection.PLAYOFF_IMPORTANCE, start],
+                                sort_keys=True).encode())
+        key = key.hexdigest()
+        cachePath = Path(cacheDir) / "ratings" / "season{0}-{1}.json".format(name, key[:16])
+
+        try:
+            with open(cachePath) as cacheFile:
+                cached = json.load(cacheFile)
+        except (OSError, ValueError):
+            cached = None
+
+        if cached is not None and cached['key'] == key:
+            final = cached['ratings']
+        else:
+            final = finalRatings(loadCompiled(path, cacheDir), start)
+            writeFile(cachePath, json.dumps({'key': key, 'ratings': final}, indent=4))
+
+        results.append(SeasonRatings(name, start, final, cached is not None and cached['key'] == key))
+        start = projection.regressRatings(final)
+
+    return results
+
+# Starting Ratings Function
+#
+# The ratings a season starts from, backtested from every earlier season on
+# file. None for the first one.
+
+def startingRatings (season, dataDir=DATA_DIR, cacheDir=CACHE_DIR):
+    earlier = [name for name in seasonNames(dataDir) if name < season]
+    if not earlier:
+        return None
+    return projection.regressRatings(backtest(earlier, dataDir, cacheDir)[-1].final)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('seasons', nargs='*')
+
+    args = parser.parse_args()
+
+    started = time.time()
+
+    for result in backtest(args.seasons or None):
+        best = max(result.final, key=result.final.get)
+        print("{0}  {1:>2} teams  {2:<6}  best {3} ({4:.1f})".format(result.season, len(result.final),
+                "cached" if result.cached else "played", best, result.final[best]))
+
+    print("{0:.3f}s".format(time.time() - started))
@@ -0,0 +1,197 @@
+'''
+    Benchmarks
+
+    2017 Jacob Grishey
+
+    For the purpose of timing the simulation hot paths on
+    fixed seasons and seeds, and keeping every run's numbers
+    so changes in speed show up.
+'''
+
+# IMPORTS
+
+import json
+import time
+import timeit
+import itertools
+import argparse
+import platform
+import resource
+import subprocess
+import tracemalloc
+import numpy
+from pathlib import Path
+import vecsim
+import projection
+from gametable import GameTable
+from bracket import seedBatch, pairRound
+from teams import TEAMS, newTable, copyTable
+
+SEASON_PATH = "./../data/season2017-18.json"
+RESULTS_PATH = "./../bench.jsonl"
+SEED = 2017
+
+# Fixtures
+#
+# The 2017-18 season as it stood on each date: games on or after it are still
+# to be played.
+
+FIXTURES = {
+    'early': "2017-11-01",
+    'late': "2018-03-25",
+    'playoffs': "2018-04-28"
+}
+
+# Cut Season Function
+#
+# Given a season and a date, return the season as it stood that morning.
+
+def cutSeason (season, date):
+    return [dict(game, resultType="TBD", homeGoals=0, awayGoals=0) if game['date'] >= date else game
+            for game in season]
+
+# Per Call Function
+#
+# Best time per call of fn, in microseconds, over a few repeats of enough
+# calls to take about 0.2s each.
+
+def perCall (fn, repeat=5):
+    timer = timeit.Timer(fn)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * 0.2 / max(elapsed, 1e-9)))
+    return min(timer.repeat(repeat, number)) / number * 1e6
+
+# Bench Fixture Function
+#
+# Time the hot paths on one fixture. Returns a dict of results by name.
+
+def benchFixture (season, iterations):
+    games = GameTable(season)
+    state = projection.prepare(games, today="2000-01-01")
+    results = {}
+
+    # Elo replay of every completed regular season game
+    if len(games.pastReg):
+        game = games.game(games.pastReg[0])
+        table = newTable()
+        results['processGame'] = perCall(lambda: projection.processGame(game, table))
+        results['replay'] = perCall(lambda: [projection.processGame(games.game(i), copy)
+                                                for copy in [copyTable(table)] for i in games.pastReg.tolist()], 3)
+
+    # Standings and seeding of a batch, per simulation
+    rng = numpy.random.default_rng(SEED)
+    records = numpy.array(state.baseline.records) + numpy.stack(vecsim.simRegularSeason(
+                state.futureHome, state.futureAway, state.futureProb, len(TEAMS), projection.BATCH_SIZE, rng), axis=2)
+    pts = records[:, :, 0] * 2 + records[:, :, 2]
+    row = records[:, :, 3]
+    results['seedBatch'] = perCall(lambda: seedBatch(pts, row)) / projection.BATCH_SIZE
+
+    # The playoffs of one season, seeded up front
+    if state.baseline.seeding is None:
+        brackets = seedBatch(pts, row)[0].tolist()
+    else:
+        brackets = [None] * projection.BATCH_SIZE
+    seasons = itertools.cycle(zip(pts.tolist(), row.tolist(), brackets))
+    results['runSeason'] = perCall(lambda: projection.runSeason(state, [], *next(seasons), rng))
+
+    # One playoff round from its first game
+    if state.playoffs and state.baseline.roundNumber <= 4:
+        baseline = state.baseline
+        pts = [w * 2 + otl for w, l, otl, row in baseline.records]
+        row = [record[3] for record in baseline.records]
+        fresh = pairRound(baseline.roundNumber, baseline.brackets, pts, row)
+        results['simRound'] = perCall(lambda: projection.simRound([dict(series, hWins=0, aWins=0) for series in fresh],
+                                                                    baseline.elo, rng))
+
+    # Full projection, fixed seed, then again traced for peak memory
+    started = time.perf_counter()
+    projection.project(season, iterations=iterations, seed=SEED, today="2000-01-01")
+    results['iterationsPerSecond'] = iterations / (time.perf_counter() - started)
+
+    tracemalloc.start()
+    projection.project(season, iterations=iterations, seed=SEED, today="2000-01-01")
+    results['peakMemoryMB'] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+
+    return results
+
+# Run Benchmarks Function
+#
+# Time the model functions and every fixture. Returns the run record.
+
+def runBenchmarks (season, iterations, fixtures=FIXTURES):
+    results = {
+        'expectedScoreA': perCall(lambda: projection.expectedScoreA(1550.0, 1480.0)),
+        'newRating': perCall(lambda: projection.newRating(1550.0, 1480.0, 1.0, 0.6, 2, "R"))
+    }
+
+    for name, date in fixtures.items():
+        for key, value in benchFixture(cutSeason(season, date), iterations).items():
+            results[name + "." + key] = value
+
+    return {
+        'time': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'commit': gitCommit(),
+        'python': platform.python_version(),
+        'iterations': iterations,
+        'seed': SEED,
+        'maxRSSMB': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2 ** 10,
+        'results': results
+    }
+
+def gitCommit ():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return None
+
+# Read Runs Function
+#
+# Every earlier run kept in path, oldest first.
+
+def readRuns (path=RESULTS_PATH):
+    if not Path(path).is_file():
+        return []
+    with open(path) as runsFile:
+        return [json.loads(line) for line in runsFile if line.strip()]
+
+def appendRun (run, path=RESULTS_PATH):
+    with open(path, "a") as runsFile:
+        runsFile.write(json.dumps(run) + "\n")
+
+# Report Function
+#
+# Print every result next to the previous run's, with the change. Times are
+# in microseconds per call.
+
+def report (run, previous=None):
+    print("{0:<30} {1:>12} {2:>12} {3:>8}".format("benchmark", "this run", "previous", "change"))
+    for name, value in run['results'].items():
+        line = "{0:<30} {1:>12.2f}".format(name, value)
+        if previous is not None and name in previous['results']:
+            before = previous['results'][name]
+            line += " {0:>12.2f} {1:>+7.1f}%".format(before, 100 * (value - before) / before if before else 0.0)
+        print(line)
+    print("max RSS {0:.1f} MB".format(run['maxRSSMB']))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--fixtures', nargs='+', choices=list(FIXTURES))
+    parser.add_argument('--results', default=RESULTS_PATH)
+    parser.add_argument('--no-save', action='store_true')
+
+    args = parser.parse_args()
+
+    with open(SEASON_PATH) as seasonFile:
+        SEASON = json.load(seasonFile)
+
+    fixtures = {name: FIXTURES[name] for name in args.fixtures or FIXTURES}
+    runs = readRuns(args.results)
+    run = runBenchmarks(SEASON, args.iterations, fixtures)
+
+    report(run, runs[-1] if runs else None)
+
+    if not args.no_save:
+        appendRun(run, args.results)
@@ -0,0 +1,211 @@
+'''
+    Playoff Bracket
+
+    2017 Jacob Grishey
+
+    For the purpose of seeding the playoffs, pairing each round
+    and computing exact playoff odds once seeding is fixed.
+'''
+
+# IMPORTS
+
+import numpy
+from series import seriesWinProbability
+from teams import TEAMS, ATLANTIC_IDS, CENTRAL_IDS, METRO_IDS, PACIFIC_IDS
+
+# Result earned by the winners of each round
+
+ROUND_RESULTS = ['r2', 'r3', 'r4', 'cup']
+
+# Tiebreaks
+#
+# Teams tied on points and ROW are ranked in a fixed order that depends on the
+# ranking: team id order within a division, and the divisions in the order
+# listed for each wider ranking. Every ranking key below is points, then ROW,
+# then that order, packed into one integer so no two teams ever tie.
+
+def tiebreakOrder (*divisions):
+    order = numpy.zeros(len(TEAMS), dtype=numpy.int64)
+    for position, team in enumerate(team for division in divisions for team in division):
+        order[team] = len(TEAMS) - position
+    return order
+
+DIVISION_ORDER = tiebreakOrder(range(len(TEAMS)))
+EAST_ORDER = tiebreakOrder(ATLANTIC_IDS, METRO_IDS)
+WEST_ORDER = tiebreakOrder(CENTRAL_IDS, PACIFIC_IDS)
+LEAGUE_ORDER = tiebreakOrder(CENTRAL_IDS, PACIFIC_IDS, ATLANTIC_IDS, METRO_IDS)
+WILD_CARD_EAST_ORDER = tiebreakOrder(METRO_IDS, ATLANTIC_IDS)
+WILD_CARD_WEST_ORDER = tiebreakOrder(PACIFIC_IDS, CENTRAL_IDS)
+
+# Standing Function
+#
+# Points then ROW as one number, ROW being under 256. Ranking keys add the
+# tiebreak order below that.
+
+def standing (pts, row):
+    return numpy.asarray(pts, dtype=numpy.int64) * 256 + numpy.asarray(row, dtype=numpy.int64)
+
+def rankingKeys (standings, order):
+    return standings * (len(TEAMS) + 1) + order
+
+# Rank Function
+#
+# Given ranking keys (simulations x teams) and the teams to rank, the same for
+# every simulation or one row each, return them best first in every
+# simulation.
+
+def rank (keys, teams):
+    teams = numpy.broadcast_to(teams, (len(keys), numpy.shape(teams)[-1]))
+    order = numpy.argsort(-numpy.take_along_axis(keys, teams, axis=1), axis=1)
+    return numpy.take_along_axis(teams, order, axis=1)
+
+# Seed Batch Function
+#
+# Given the points and ROW of every team in a batch of simulations, as
+# (simulations x teams) arrays, rank the divisions and pick the wild cards of
+# every simulation at once. Returns the four division brackets (Atlantic,
+# Central, Metropolitan, Pacific) of team ids in seed order, as a
+# (simulations x 4 x 4) array, and the teams earning each seeding result as
+# one (simulations x teams earning it) array per result.
+
+def seedBatch (pts, row):
+    standings = standing(pts, row)
+
+    def keys (order):
+        return rankingKeys(standings, order)
+
+    # Sort teams into divisions, by points
+    atlantic, central, metro, pacific = [rank(keys(DIVISION_ORDER), division)
+                                            for division in [ATLANTIC_IDS, CENTRAL_IDS, METRO_IDS, PACIFIC_IDS]]
+    west = rank(keys(WEST_ORDER), CENTRAL_IDS + PACIFIC_IDS)[:, 0]
+    east = rank(keys(EAST_ORDER), ATLANTIC_IDS + METRO_IDS)[:, 0]
+    league = rank(keys(LEAGUE_ORDER), range(len(TEAMS)))[:, :1]
+
+    # Get wild cards
+    wildCardsEast = rank(keys(WILD_CARD_EAST_ORDER), numpy.concatenate((metro[:, 3:], atlantic[:, 3:]), axis=1))[:, :2]
+    wildCardsWest = rank(keys(WILD_CARD_WEST_ORDER), numpy.concatenate((pacific[:, 3:], central[:, 3:]), axis=1))[:, :2]
+
+    # Top 3 in each division, the fourth place replaced by a wild card below
+    brackets = numpy.stack([atlantic[:, :4], central[:, :4], metro[:, :4], pacific[:, :4]], axis=1)
+
+    # Assign wild cards, the division winner leading the conference plays the
+    # second wild card
+    for first, second, wildCards, leader in [(2, 0, wildCardsEast, east), (1, 3, wildCardsWest, west)]:
+        firstBetter = brackets[:, first, 0] == leader
+        brackets[:, first, 3] = numpy.where(firstBetter, wildCards[:, 1], wildCards[:, 0])
+        brackets[:, second, 3] = numpy.where(firstBetter, wildCards[:, 0], wildCards[:, 1])
+
+    seeding = {
+        'd1': brackets[:, :, 0], 'd2': brackets[:, :, 1], 'd3': brackets[:, :, 2],
+        'wc1': numpy.stack([wildCardsEast[:, 0], wildCardsWest[:, 0]], axis=1),
+        'wc2': numpy.stack([wildCardsEast[:, 1], wildCardsWest[:, 1]], axis=1),
+        'pres': league,
+        'conf': numpy.stack([west, east], axis=1)
+    }
+
+    return brackets, seeding
+
+# Conference Places Function
+#
+# Given points and ROW as for seedBatch, return every team's place in its
+# conference standings, from 1, as a (simulations x teams) array.
+
+def conferencePlaces (pts, row):
+    standings = standing(pts, row)
+    places = numpy.zeros(standings.shape, dtype=numpy.int64)
+
+    for order, conference in [(EAST_ORDER, ATLANTIC_IDS + METRO_IDS), (WEST_ORDER, CENTRAL_IDS + PACIFIC_IDS)]:
+        ranked = rank(rankingKeys(standings, order), conference)
+        numpy.put_along_axis(places, ranked, numpy.arange(1, len(conference) + 1), axis=1)
+
+    return places
+
+# Seed Playoffs Function
+#
+# Given each team's points and ROW by team id, rank the divisions and pick the
+# wild cards. Returns the four division brackets (Atlantic, Central,
+# Metropolitan, Pacific) as team ids in seed order, and the teams earning
+# each seeding result.
+
+def seedPlayoffs (pts, row):
+    brackets, seeding = seedBatch([pts], [row])
+    return brackets[0].tolist(), {result: ids[0].tolist() for result, ids in seeding.items()}
+
+# Pair Round Function
+#
+# Given the teams left in each division bracket and the final standings,
+# schedule the series of a playoff round (1 to 4), higher seed at home.
+
+def pairRound (roundNumber, brackets, pts, row):
+    if roundNumber == 1:
+        pairs = [(division[i], division[3-i]) for division in brackets for i in range(0, 2)]
+    elif roundNumber == 2:
+        pairs = [(division[0], division[1]) for division in brackets]
+    else:
+        atlantic, central, metro, pacific = brackets
+        conferences = [atlantic + metro, central + pacific] if roundNumber == 3 else [atlantic + central + metro + pacific]
+        conferences = [sorted(conference, key=lambda team: (pts[team], row[team]), reverse=True) for conference in conferences]
+        pairs = [(conference[0], conference[1]) for conference in conferences]
+
+    return [{'home': home, 'away': away, 'hWins': 0, 'aWins': 0} for home, away in pairs]
+
+# Advance Bracket Function
+#
+# Given a finished round, return its winners and the brackets without the losers.
+
+def advanceBracket (roundSeries, brackets):
+    winners = [series['home'] if series['hWins'] == 4 else series['away'] for series in roundSeries]
+    return winners, [[team for team in division if team in winners] for division in brackets]
+
+# Propagate Bracket Function
+#
+# Given the round in progress, its series, the brackets going into it, Elo
+# ratings and final standings, return the exact probability of every team
+# winning each round still to be decided, as {result: {team: probability}}.
+# Each round's winner distributions are merged pairwise the same way
+# pairRound pairs the teams, so no bracket is ever sampled.
+
+def propagateBracket (roundNumber, roundSeries, brackets, elo, pts, row):
+    divisionOf = {team: i for i, division in enumerate(brackets) for team in division}
+    positionOf = {team: j for division in brackets for j, team in enumerate(division)}
+
+    # Higher seed first: bracket position within a division, standings beyond.
+    def divisionOrder (a, b):
+        return (a, b) if positionOf[a] < positionOf[b] else (b, a)
+
+    def standingsOrder (a, b):
+        keyA = (-pts[a], -row[a], divisionOf[a])
+        keyB = (-pts[b], -row[b], divisionOf[b])
+        return (a, b) if keyA <= keyB else (b, a)
+
+    # Winner distribution of a series between two winner distributions
+    def merge (slotA, slotB, order):
+        winner = {}
+        for a, probA in slotA.items():
+            for b, probB in slotB.items():
+                home, away = order(a, b)
+                meet = probA * probB
+                win = seriesWinProbability(elo[home], elo[away])
+                winner[home] = winner.get(home, 0.0) + meet * win
+                winner[away] = winner.get(away, 0.0) + meet * (1 - win)
+        return winner
+
+    slots = []
+
+    for series in roundSeries:
+        win = seriesWinProbability(elo[series['home']], elo[series['away']], series['hWins'], series['aWins'])
+        slots.append({series['home']: win, series['away']: 1 - win})
+
+    odds = {}
+
+    for number in range(roundNumber, 5):
+        odds[ROUND_RESULTS[number - 1]] = {team: prob for slot in slots for team, prob in slot.items()}
+
+        if number == 1:
+            slots = [merge(slots[2*i], slots[2*i+1], divisionOrder) for i in range(0, 4)]
+        elif number == 2:
+            slots = [merge(slots[0], slots[2], standingsOrder), merge(slots[1], slots[3], standingsOrder)]
+        elif number == 3:
+            slots = [merge(slots[0], slots[1], standingsOrder)]
+
+    return odds
@@ -0,0 +1,175 @@
+'''
+    Model Calibration
+
+    2017 Jacob Grishey
+
+    For the purpose of scoring many settings of the Elo and
+    overtime model against past seasons at once.
+'''
+
+# IMPORTS
+
+import json
+import time
+import argparse
+import itertools
+import numpy
+from multiprocessing import Pool
+import vecsim
+import projection
+import backtest
+from gametable import GameTable, REG, OT, SO, PLAYOFF
+from season import loadCompiled
+from teams import TEAMS
+
+# Season Games Function
+#
+# Given season names, return every counted game of them as arrays in replay
+# order, one dict per season: teams, goal differential, actual scores, home
+# win, playoff flag and outcome category. The six outcome categories are home
+# regulation, overtime and shootout wins, then the same for the away team.
+#
+# Playoff games are replayed in date order, where the model's replayPlayoffs
+# goes round by round and skips games outside the bracket it seeds. For a
+# complete season every counted playoff game is in that bracket, and a team
+# finishes a round before playing the next, so both give the same ratings.
+# Stray playoff games outside the bracket would count here but not there.
+
+def seasonGames (seasons, dataDir=backtest.DATA_DIR):
+    result = []
+
+    for name in seasons:
+        games = GameTable(loadCompiled("{0}/season{1}.json".format(dataDir, name)))
+        order = numpy.sort(numpy.concatenate((games.pastReg, games.pastPO)))
+        homeWon = games.homeGoals[order] > games.awayGoals[order]
+        resultType = games.resultType[order]
+        loserScore = numpy.where(resultType == REG, 0.0, 0.5)
+
+        result.append({
+            'home': games.home[order],
+            'away': games.away[order],
+            'goalDifferential': numpy.abs(games.homeGoals[order] - games.awayGoals[order]),
+            'homeScore': numpy.where(homeWon, 1.0, loserScore),
+            'awayScore': numpy.where(homeWon, loserScore, 1.0),
+            'outcome': numpy.where(homeWon, 0, 3) + numpy.select([resultType == OT, resultType == SO], [1, 2], 0),
+            'homeWon': homeWon.astype(float),
+            'playoff': games.gameType[order] == PLAYOFF
+        })
+
+    return result
+
+# Score Parameters Function
+#
+# Given the games of consecutive seasons and one array per parameter (K,
+# playoff importance, OT rate, shootout share) of the settings to score,
+# replay every setting side by side. Regular season games after the first
+# warmup seasons are scored before their result is applied. Returns the mean
+# log-loss over the six outcome categories and the Brier score of the home
+# win probability, one per setting.
+
+def scoreParameters (seasons, k, importance, otRate, soShare, warmup=1):
+    settings = len(k)
+    elo = numpy.full((settings, len(TEAMS)), 1500.0)
+    logLoss = numpy.zeros(settings)
+    brier = numpy.zeros(settings)
+    scored = 0
+
+    # Probability of each outcome category given a home win probability p,
+    # as p * winShares + (1 - p) * lossShares.
+    winShares = numpy.stack([1 - otRate, otRate * (1 - soShare), otRate * soShare,
+                                numpy.zeros(settings), numpy.zeros(settings), numpy.zeros(settings)], axis=1)
+    lossShares = numpy.roll(winShares, 3, axis=1)
+
+    for number, games in enumerate(seasons):
+        if number > 0:
+            elo = (elo - 1500) * (2 / 3) + 1500
+
+        weight = numpy.where(games['playoff'][:, None], k * importance, k)
+
+        for i, (home, away) in enumerate(zip(games['home'].tolist(), games['away'].tolist())):
+            homeElo = elo[:, home]
+            awayElo = elo[:, away]
+            eA = vecsim.expectedScores(homeElo, awayElo)
+
+            if number >= warmup and not games['playoff'][i]:
+                outcome = games['outcome'][i]
+                prob = eA * winShares[:, outcome] + (1 - eA) * lossShares[:, outcome]
+                logLoss -= numpy.log(prob)
+                brier += (eA - games['homeWon'][i]) ** 2
+                scored += 1
+
+            marginMult = numpy.log(games['goalDifferential'][i] + 1) * (2.2 / (numpy.abs(homeElo - awayElo) * 0.01 + 2.2))
+            elo[:, home] = homeElo + marginMult * weight[i] * (games['homeScore'][i] - eA)
+            elo[:, away] = awayElo + marginMult * weight[i] * (games['awayScore'][i] - (1 - eA))
+
+    return logLoss / max(scored, 1), brier / max(scored, 1)
+
+# Worker state
+#
+# Pool workers receive the games once, when they start.
+
+workerGames = None
+
+def initWorker (games, warmup):
+    global workerGames
+    workerGames = (games, warmup)
+
+def scoreChunk (chunk):
+    games, warmup = workerGames
+    return scoreParameters(games, *chunk, warmup=warmup)
+
+# Calibrate Function
+#
+# Score every combination of the given parameter values over the given
+# seasons, split into a few chunks per worker process. Returns one dict per
+# setting, best log-loss first.
+
+def calibrate (seasons, ks, importances, otRates, soShares, workers=1, warmup=1):
+    games = seasonGames(seasons)
+    grid = numpy.array(list(itertools.product(ks, importances, otRates, soShares)), dtype=float)
+    numChunks = min(len(grid), workers * 4) if workers > 1 else 1
+    chunks = [tuple(chunk.T) for chunk in numpy.array_split(grid, numChunks)]
+
+    if workers > 1:
+        with Pool(workers, initializer=initWorker, initargs=(games, warmup)) as pool:
+            scores = pool.map(scoreChunk, chunks)
+    else:
+        scores = [scoreParameters(games, *chunk, warmup=warmup) for chunk in chunks]
+
+    logLoss = numpy.concatenate([chunkScores[0] for chunkScores in scores])
+    brier = numpy.concatenate([chunkScores[1] for chunkScores in scores])
+
+    results = [{'k': k, 'importance': importance, 'otRate': otRate, 'soShare': soShare,
+                'logLoss': float(loss), 'brier': float(score)}
+                for (k, importance, otRate, soShare), loss, score in zip(grid.tolist(), logLoss, brier)]
+
+    return sorted(results, key=lambda result: result['logLoss'])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('--seasons', nargs='+')
+    parser.add_argument('--k', type=float, nargs='+', default=[projection.K_FACTOR])
+    parser.add_argument('--importance', type=float, nargs='+', default=[projection.PLAYOFF_IMPORTANCE])
+    parser.add_argument('--ot-rate', type=float, nargs='+', default=[vecsim.OT_RATE])
+    parser.add_argument('--so-share', type=float, nargs='+', default=[vecsim.SO_RATE])
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--out')
+
+    args = parser.parse_args()
+
+    started = time.time()
+    seasons = args.seasons or backtest.seasonNames()
+
+    results = calibrate(seasons, args.k, args.importance, args.ot_rate, args.so_share, args.workers, args.warmup)
+
+    print("{0:>6} {1:>10} {2:>7} {3:>8} {4:>9} {5:>7}".format("K", "importance", "otRate", "soShare", "logLoss", "brier"))
+    for result in results[:args.top]:
+        print("{k:6.2f} {importance:10.2f} {otRate:7.3f} {soShare:8.3f} {logLoss:9.5f} {brier:7.5f}".format(**result))
+    print("{0} settings over {1} seasons in {2:.1f}s".format(len(results), len(seasons), time.time() - started))
+
+    if args.out is not None:
+        with open(args.out, "w") as outFile:
+            json.dump(results, outFile, indent=4)
@@ -0,0 +1,82 @@
+'''
+    Result Distributions
+
+    2017 Jacob Grishey
+
+    For the purpose of keeping the distribution of every team's
+    final points, wins and conference place over simulations,
+    at a fixed size however many are run.
+'''
+
+# IMPORTS
+
+import numpy
+from teams import TEAMS
+
+# Histogram bins
+#
+# One bin per value, from 0 up to the most an 82 game season allows: 164
+# points, 82 wins and 16th place in a conference. Values past the last bin
+# are counted in it.
+
+BINS = {'pts': 165, 'w': 83, 'place': 17}
+
+# Percentiles published for every distribution
+
+PERCENTILES = [5, 25, 50, 75, 95]
+
+# Histograms
+#
+# Per distribution, a (teams x bins) matrix of how many simulations ended with
+# each value. Adding a batch is one bincount; histograms from other workers
+# merge by adding counts.
+
+class Histograms:
+    def __init__ (self):
+        self.counts = {name: numpy.zeros((len(TEAMS), bins), dtype=numpy.int64) for name, bins in BINS.items()}
+
+    # Add Function
+    #
+    # Given one value per team in each of a batch of simulations, as a
+    # (simulations x teams) array, count them weight times.
+
+    def add (self, name, values, weight=1):
+        counts = self.counts[name]
+        bins = counts.shape[1]
+        slots = numpy.clip(values, 0, bins - 1) + numpy.arange(len(TEAMS)) * bins
+        counts += numpy.bincount(slots.ravel(), minlength=counts.size).reshape(counts.shape) * weight
+
+    def merge (self, other):
+        for name, counts in other.counts.items():
+            self.counts[name] += counts
+
+    # Percentiles Function
+    #
+    # Every team's PERCENTILES of a distribution, as a (teams x PERCENTILES)
+    # array: the lowest value that share of simulations ended at or below.
+
+    def percentiles (self, name):
+        cumulative = numpy.cumsum(self.counts[name], axis=1)
+        thresholds = cumulative[:, -1:] * numpy.array(PERCENTILES) / 100
+        return numpy.argmax(cumulative[:, :, None] >= thresholds[:, None, :], axis=1)
+
+    # Report Function
+    #
+    # Every team's distributions in the results files, as a (dist, pctl) pair
+    # per team id: the counts, scaled by scale, from the lowest value seen to
+    # the highest, and the percentiles.
+
+    def report (self, scale):
+        reports = [({}, {}) for team in TEAMS]
+
+        for name, counts in self.counts.items():
+            percentiles = self.percentiles(name).tolist()
+            scaled = (counts * scale).round().astype(numpy.int64)
+
+            for team, (dist, pctl) in enumerate(reports):
+                seen = numpy.flatnonzero(counts[team])
+                low, high = (int(seen[0]), int(seen[-1])) if len(seen) else (0, -1)
+                dist[name] = {'min': low, 'counts': scaled[team, low:high + 1].tolist()}
+                pctl[name] = percentiles[team]
+
+        return reports
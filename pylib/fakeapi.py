@@ -0,0 +1,187 @@
+'''
+    Fake Schedule API
+
+    2017 Jacob Grishey
+
+    For the purpose of running the scraper against a local
+    stand-in for the schedule API, built from the season
+    files on disk, with slow and failing requests.
+'''
+
+# IMPORTS
+
+import json
+import time
+import random
+import argparse
+import functools
+import threading
+import collections
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import scrape
+from season import loadSeason
+from atomicfile import writeFile
+
+# Schedule Response Function
+#
+# Given games in the season file format, return the schedule API response
+# listing them, with just the fields getGames reads. All-star games are left
+# out, as getGames skips them.
+
+def scheduleResponse (games):
+    byDate = collections.defaultdict(list)
+
+    for game in games:
+        if game['gameType'] == "A":
+            continue
+        teams = {'home': {'team': {'name': game['homeTeam']}}, 'away': {'team': {'name': game['awayTeam']}}}
+        entry = {'gameType': game['gameType'], 'teams': teams}
+        if game['resultType'] == "TBD":
+            entry['status'] = {'detailedState': "Scheduled"}
+        else:
+            entry['status'] = {'detailedState': "Final"}
+            entry['linescore'] = {
+                'currentPeriodOrdinal': "3rd" if game['resultType'] == "REG" else game['resultType'],
+                'teams': {'home': {'team': {'name': game['homeTeam']}, 'goals': game['homeGoals']},
+                            'away': {'team': {'name': game['awayTeam']}, 'goals': game['awayGoals']}}
+            }
+        byDate[game['date']].append(entry)
+
+    return {'dates': [{'date': date, 'games': byDate[date]} for date in sorted(byDate)]}
+
+# Fake API
+#
+# Answers GET /schedule?startDate=...&endDate=... like the real API, after
+# latency seconds, or with a 500 error for a failRate share of requests.
+# Counts requests and failures.
+
+class FakeAPI (ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__ (self, games, port=0, failRate=0.0, latency=0.0):
+        super().__init__(("127.0.0.1", port), Handler)
+        self.response = scheduleResponse(games)
+        self.failRate = failRate
+        self.latency = latency
+        self.requests = 0
+        self.failures = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url (self):
+        return "http://127.0.0.1:{0}".format(self.server_address[1])
+
+class Handler (BaseHTTPRequestHandler):
+    def do_GET (self):
+        api = self.server
+        url = urllib.parse.urlparse(self.path)
+        query = urllib.parse.parse_qs(url.query)
+
+        time.sleep(api.latency)
+        failed = random.random() < api.failRate
+        with api.lock:
+            api.requests += 1
+            api.failures += failed
+
+        if url.path != "/schedule" or 'startDate' not in query or 'endDate' not in query:
+            return self.respond(404, {'error': "unknown request " + self.path})
+        if failed:
+            return self.respond(500, {'error': "injected failure"})
+
+        dfrom, dto = query['startDate'][0], query['endDate'][0]
+        self.respond(200, {'dates': [date for date in api.response['dates'] if dfrom <= date['date'] <= dto]})
+
+    def respond (self, code, body):
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header('Content-Type', "application/json")
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message (self, format, *args):
+        pass
+
+# Start Function
+#
+# Start a fake API for the given games on a background thread and return it.
+# Call shutdown() on it when done.
+
+def start (games, port=0, failRate=0.0, latency=0.0):
+    api = FakeAPI(games, port, failRate, latency)
+    threading.Thread(target=api.serve_forever, daemon=True).start()
+    return api
+
+# Check Function
+#
+# Backfill the given seasons through a fake API serving their files, the
+# same way scrape.py --backfill --api does, and compare what comes back with
+# the files. Returns, per season, its name and whether every game matched,
+# then the seconds taken and the fake API.
+
+def check (seasons, failRate=0.0, latency=0.0, days=scrape.WINDOW_DAYS, workers=scrape.FETCH_WORKERS,
+            retries=scrape.RETRIES, backoff=scrape.BACKOFF):
+    files = [loadSeason("./../data/season{0}.json".format(season)) for season in seasons]
+    api = start([game for games in files for game in games], failRate=failRate, latency=latency)
+
+    try:
+        started = time.time()
+        fetch = functools.partial(scrape.fetchSchedule, api=api.url, timeout=10)
+        scraped = scrape.backfill([scrape.seasonDates(season) for season in seasons], fetch, days, workers, retries,
+                                    backoff)
+        elapsed = time.time() - started
+    finally:
+        api.shutdown()
+        api.server_close()
+
+    results = []
+    for season, games, expected in zip(seasons, scraped, files):
+        expected = [game for game in expected if game['gameType'] != "A"]
+        results.append((season, games == expected))
+
+    return results, elapsed, api
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('--serve', nargs='+', metavar='SEASON')
+    parser.add_argument('--check', nargs='+', metavar='SEASON')
+    parser.add_argument('--record', metavar='SEASON')
+    parser.add_argument('--dfrom')
+    parser.add_argument('--dto')
+    parser.add_argument('--out')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--fail-rate', type=float, default=0.0)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--window', type=int, default=scrape.WINDOW_DAYS)
+    parser.add_argument('--threads', type=int, default=scrape.FETCH_WORKERS)
+    parser.add_argument('--retries', type=int, default=scrape.RETRIES)
+    parser.add_argument('--backoff', type=float, default=scrape.BACKOFF)
+
+    args = parser.parse_args()
+
+    if args.check:
+        # e.g. --check 2016-17 2017-18 --fail-rate 0.2 --latency 0.05
+        results, elapsed, api = check(args.check, args.fail_rate, args.latency, args.window, args.threads,
+                                        args.retries, args.backoff)
+        for season, matched in results:
+            print("season{0}: {1}".format(season, "matches the file" if matched else "DIFFERS from the file"))
+        print("{0} requests, {1} failed, {2:.1f}s".format(api.requests, api.failures, elapsed))
+        if not all(matched for season, matched in results):
+            raise SystemExit(1)
+    elif args.record:
+        # A recorded response for scrape.py --fixture, e.g. --record 2016-17
+        # --dfrom 2017-04-08 --dto 2017-04-13 --out fixtures/schedule2016-17.json
+        games = loadSeason("./../data/season{0}.json".format(args.record))
+        response = scheduleResponse([game for game in games if args.dfrom <= game['date'] <= args.dto])
+        writeFile(args.out, json.dumps(response, indent=4))
+    elif args.serve:
+        # Serve until interrupted, for scrape.py --api http://127.0.0.1:PORT
+        games = [game for season in args.serve for game in loadSeason("./../data/season{0}.json".format(season))]
+        api = FakeAPI(games, args.port, args.fail_rate, args.latency)
+        print("serving " + api.url, flush=True)
+        try:
+            api.serve_forever()
+        except KeyboardInterrupt:
+            api.server_close()
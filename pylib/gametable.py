@@ -0,0 +1,115 @@
+'''
+    Game Table
+
+    2017 Jacob Grishey
+
+    For the purpose of holding a season's games as
+    columns of integers, with the games every part of
+    the model needs found once up front.
+'''
+
+# IMPORTS
+
+import re
+import datetime
+import numpy
+from collections import namedtuple
+from season import CompiledSeason, compileSeason
+from teams import TEAMS, TEAM_IDS, franchise
+
+# Result and game type codes. Playoff games past one overtime, like 2OT, are
+# OT games; anything else unknown, like the 2nd of an all-star game, is
+# OTHER_RESULT.
+
+REG, OT, SO, TBD, OTHER_RESULT = range(5)
+RESULT_CODES = {'REG': REG, 'OT': OT, 'SO': SO, 'TBD': TBD}
+
+def resultCode (name):
+    if re.fullmatch(r"[2-9]OT", name):
+        return OT
+    return RESULT_CODES.get(name, OTHER_RESULT)
+
+REGULAR, PLAYOFF, OTHER_GAME = range(3)
+GAME_CODES = {'R': REGULAR, 'P': PLAYOFF}
+
+# Game
+#
+# One game as team ids, goals and result code.
+
+Game = namedtuple('Game', ['home', 'away', 'homeGoals', 'awayGoals', 'resultType'])
+
+# Game Table
+#
+# Columns, one entry per game in season order:
+#   date         date ordinal
+#   home, away   team ids of the current franchise, -1 for teams outside the
+#                league, like all-star teams
+#   homeGoals, awayGoals
+#   resultType   REG, OT, SO, TBD or OTHER_RESULT
+#   gameType     REGULAR, PLAYOFF or OTHER_GAME
+#
+# Index sets, as arrays of game indexes in season order: pastReg and pastPO
+# are completed regular season and playoff games counted by the model (REG, OT
+# or SO), futureReg and futurePO the ones still to be played. Games with a
+# team outside the league are in none of them. schedules[team]
+# holds the indexes of every game a team plays in, and dates maps a date
+# ordinal to the slice of byDate holding that day's games.
+
+class GameTable:
+    def __init__ (self, season):
+        if not isinstance(season, CompiledSeason):
+            season = compileSeason(season)
+
+        games = season.games
+        teamIds = numpy.array([TEAM_IDS.get(franchise(name), -1) for name in season.teams], dtype=int)
+        resultCodes = numpy.array([resultCode(name) for name in season.resultTypes], dtype=numpy.int8)
+        gameCodes = numpy.array([GAME_CODES.get(name, OTHER_GAME) for name in season.gameTypes], dtype=numpy.int8)
+
+        self.date = numpy.array(games['date'], dtype=int)
+        self.home = teamIds[games['home']]
+        self.away = teamIds[games['away']]
+        self.homeGoals = numpy.array(games['homeGoals'], dtype=int)
+        self.awayGoals = numpy.array(games['awayGoals'], dtype=int)
+        self.resultType = resultCodes[games['resultType']]
+        self.gameType = gameCodes[games['gameType']]
+
+        known = (self.home >= 0) & (self.away >= 0)
+        counted = known & (self.resultType <= SO)
+        remaining = known & (self.resultType == TBD)
+        regular = self.gameType == REGULAR
+        playoff = self.gameType == PLAYOFF
+
+        self.pastReg = numpy.flatnonzero(counted & regular)
+        self.pastPO = numpy.flatnonzero(counted & playoff)
+        self.futureReg = numpy.flatnonzero(remaining & regular)
+        self.futurePO = numpy.flatnonzero(remaining & playoff)
+
+        # Per-team schedules
+        self.schedules = [numpy.flatnonzero((self.home == team) | (self.away == team)) for team in range(len(TEAMS))]
+
+        # Per-date slices
+        self.byDate = numpy.argsort(self.date, kind='stable')
+        days, starts, counts = numpy.unique(self.date[self.byDate], return_index=True, return_counts=True)
+        self.dates = {day: slice(start, start + count) for day, start, count in zip(days.tolist(), starts.tolist(), counts.tolist())}
+
+        # Python lists of the columns read game by game
+        self.rows = list(zip(self.home.tolist(), self.away.tolist(), self.homeGoals.tolist(),
+                                self.awayGoals.tolist(), self.resultType.tolist()))
+
+    def __len__ (self):
+        return len(self.date)
+
+    # Game Function
+    #
+    # The game at index i.
+
+    def game (self, i):
+        return Game(*self.rows[i])
+
+    # On Date Function
+    #
+    # Indexes of the games played on a date, given as "YYYY-MM-DD", in season order.
+
+    def onDate (self, date):
+        day = datetime.date.fromisoformat(date).toordinal()
+        return self.byDate[self.dates.get(day, slice(0, 0))]
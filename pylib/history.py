@@ -0,0 +1,149 @@
+'''
+    Results History
+
+    2017 Jacob Grishey
+
+    For the purpose of keeping every day's results in an
+    append-only file, and exporting them as one JSON array.
+'''
+
+# IMPORTS
+
+import json
+import os
+import argparse
+from pathlib import Path
+from atomicfile import writeFile
+
+# Files of a history
+#
+# Given a base path like ./../data/results2017-18, snapshots live one per line
+# in base.jsonl and the index, one "date offset length" line per snapshot,
+# in base.idx. The exported array is base.json, the format the site reads.
+
+def snapshotsPath (base):
+    return Path(str(base) + ".jsonl")
+
+def indexPath (base):
+    return Path(str(base) + ".idx")
+
+def arrayPath (base):
+    return Path(str(base) + ".json")
+
+# Read Index Function
+#
+# Return the index as a list of (date, offset, length), oldest first.
+
+def readIndex (base):
+    if not indexPath(base).is_file():
+        return []
+    entries = []
+    with open(indexPath(base)) as indexFile:
+        for line in indexFile:
+            parts = line.split()
+            if len(parts) == 3:
+                entries.append((parts[0], int(parts[1]), int(parts[2])))
+    return entries
+
+# Recover Function
+#
+# Make the snapshot file and index agree before appending. Complete snapshots
+# written after the last indexed one (a crash between the two writes) are
+# indexed, and a torn last line is cut off.
+
+def recover (base, entries):
+    path = snapshotsPath(base)
+    end = entries[-1][1] + entries[-1][2] if entries else 0
+
+    if not path.is_file() or path.stat().st_size == end:
+        return entries
+
+    with open(path, "rb+") as snapshotFile:
+        snapshotFile.seek(end)
+        for line in snapshotFile.read().splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break
+            try:
+                date = json.loads(line)['date']
+            except ValueError:
+                break
+            writeIndexEntry(base, date, end, len(line))
+            entries.append((date, end, len(line)))
+            end += len(line)
+        snapshotFile.truncate(end)
+
+    return entries
+
+def writeIndexEntry (base, date, offset, length):
+    with open(indexPath(base), "a") as indexFile:
+        indexFile.write("{0} {1} {2}\n".format(date, offset, length))
+        indexFile.flush()
+        os.fsync(indexFile.fileno())
+
+# Append Snapshot Function
+#
+# Add one day's results to the end of the history. Costs the same however long
+# the history is. A history kept as a plain JSON array is imported first.
+
+def appendSnapshot (base, snapshot):
+    entries = readIndex(base)
+
+    if not entries and not snapshotsPath(base).is_file() and arrayPath(base).is_file():
+        with open(arrayPath(base)) as arrayFile:
+            for previous in json.load(arrayFile):
+                entries = appendLine(base, previous, entries)
+
+    appendLine(base, snapshot, recover(base, entries))
+
+def appendLine (base, snapshot, entries):
+    line = (json.dumps(snapshot) + "\n").encode()
+    offset = entries[-1][1] + entries[-1][2] if entries else 0
+
+    with open(snapshotsPath(base), "ab") as snapshotFile:
+        snapshotFile.write(line)
+        snapshotFile.flush()
+        os.fsync(snapshotFile.fileno())
+
+    writeIndexEntry(base, snapshot['date'], offset, len(line))
+    return entries + [(snapshot['date'], offset, len(line))]
+
+# Read Snapshot Function
+#
+# Return the latest snapshot of the given date, or None.
+
+def readSnapshot (base, date):
+    matches = [entry for entry in readIndex(base) if entry[0] == date]
+    if not matches:
+        return None
+    with open(snapshotsPath(base), "rb") as snapshotFile:
+        snapshotFile.seek(matches[-1][1])
+        return json.loads(snapshotFile.read(matches[-1][2]))
+
+# Read Snapshots Function
+#
+# Return every indexed snapshot, oldest first.
+
+def readSnapshots (base):
+    snapshots = []
+    with open(snapshotsPath(base), "rb") as snapshotFile:
+        for date, offset, length in readIndex(base):
+            snapshotFile.seek(offset)
+            snapshots.append(json.loads(snapshotFile.read(length)))
+    return snapshots
+
+# Export Function
+#
+# Write the whole history as the JSON array the site reads, replacing the
+# old file only once the new one is complete.
+
+def exportArray (base):
+    writeFile(arrayPath(base), json.dumps(readSnapshots(base), indent=4))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('--export', required=True)
+
+    args = parser.parse_args()
+
+    exportArray('./../data/' + args.export)
@@ -0,0 +1,93 @@
+'''
+    Phase Profiling
+
+    2017 Jacob Grishey
+
+    For the purpose of timing each phase of a simulated
+    season, across iterations and worker processes.
+'''
+
+# IMPORTS
+
+import time
+import numpy
+
+# Phases of a projection, in the order they run. replay happens once per
+# run, regular, standings and seeding once per batch of simulated seasons,
+# and the playoff rounds once per simulated season.
+
+PHASES = ['replay', 'regular', 'standings', 'seeding', 'round1', 'round2', 'round3', 'round4']
+
+# Durations are counted in log-spaced buckets from 100 ns to 100 s, so
+# profiles are small, cheap to add to and merge by adding counts.
+
+BUCKETS = numpy.logspace(-7, 2, 181)
+
+# Phase Profile
+#
+# Call counts, total and largest time and a duration histogram per phase.
+# Code being profiled keeps a timestamp and calls lap() at the end of each
+# phase; code that may run unprofiled holds None instead of a profile and
+# skips the call.
+
+class PhaseProfile:
+    def __init__ (self):
+        self.calls = numpy.zeros(len(PHASES), dtype=numpy.int64)
+        self.totals = numpy.zeros(len(PHASES))
+        self.largest = numpy.zeros(len(PHASES))
+        self.histogram = numpy.zeros((len(PHASES), len(BUCKETS) + 1), dtype=numpy.int64)
+
+    # Lap Function
+    #
+    # Add the time since the given timestamp to a phase, and return the new
+    # timestamp.
+
+    def lap (self, phase, since):
+        now = time.perf_counter()
+        self.add(phase, now - since)
+        return now
+
+    def add (self, phase, seconds):
+        index = PHASES.index(phase)
+        self.calls[index] += 1
+        self.totals[index] += seconds
+        self.largest[index] = max(self.largest[index], seconds)
+        self.histogram[index, numpy.searchsorted(BUCKETS, seconds)] += 1
+
+    def merge (self, other):
+        self.calls += other.calls
+        self.totals += other.totals
+        self.largest = numpy.maximum(self.largest, other.largest)
+        self.histogram += other.histogram
+
+    # Report Function
+    #
+    # Per phase that ran: calls, total, mean and 99th percentile time in
+    # seconds. The percentile is the upper edge of its bucket, within about
+    # 12 % of the true value.
+
+    def report (self):
+        result = {}
+        for index, phase in enumerate(PHASES):
+            if self.calls[index] == 0:
+                continue
+            cumulative = numpy.cumsum(self.histogram[index])
+            bucket = int(numpy.searchsorted(cumulative, 0.99 * self.calls[index]))
+            result[phase] = {
+                'calls': int(self.calls[index]),
+                'total': round(float(self.totals[index]), 6),
+                'mean': float(self.totals[index] / self.calls[index]),
+                'p99': float(min(BUCKETS[min(bucket, len(BUCKETS) - 1)], self.largest[index]))
+            }
+        return result
+
+# Format Report Function
+#
+# The report as a table, times in microseconds.
+
+def formatReport (report):
+    lines = ["{0:<10} {1:>9} {2:>10} {3:>12} {4:>12}".format("phase", "calls", "total s", "mean us", "p99 us")]
+    for phase, row in report.items():
+        lines.append("{0:<10} {1:>9} {2:>10.3f} {3:>12.1f} {4:>12.1f}".format(
+                        phase, row['calls'], row['total'], row['mean'] * 1e6, row['p99'] * 1e6))
+    return "\n".join(lines)
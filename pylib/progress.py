@@ -0,0 +1,118 @@
+'''
+    Progress
+
+    2017 Jacob Grishey
+
+    For the purpose of reporting how a run is going a few times
+    a second, and summarizing where its time went.
+'''
+
+# IMPORTS
+
+import json
+import os
+import sys
+import time
+
+# Progress
+#
+# Tracks the current phase and how many of the expected iterations are done.
+# update() is cheap enough to call every iteration, it only writes a line
+# when interval seconds have passed since the last one. With no stream it
+# only keeps time.
+
+class Progress:
+    def __init__ (self, interval=0.5, stream=sys.stdout):
+        self.interval = interval
+        self.stream = stream
+        self.started = time.monotonic()
+        self.cpuStarted = cpuTime()
+        self.phases = {}
+        self.current = None
+        self.phaseStarted = self.started
+        self.lastReport = self.started
+        self.lastDetail = None
+        self.total = None
+        self.done = 0
+        self.phaseDone = 0
+
+    # Phase Function
+    #
+    # Close the current phase, with a last report if it counted iterations,
+    # and start timing the named one.
+
+    def phase (self, name, total=None):
+        now = time.monotonic()
+        if self.current is not None:
+            if self.phaseDone > 0:
+                self.report(now, self.lastDetail)
+            self.phases[self.current] = self.phases.get(self.current, 0.0) + now - self.phaseStarted
+        self.current = name
+        self.phaseStarted = now
+        self.lastReport = now
+        self.lastDetail = None
+        self.total = total
+        self.phaseDone = 0
+
+    # Update Function
+    #
+    # Given the iterations done so far in this phase, report progress if it
+    # has been long enough since the last report.
+
+    def update (self, done, detail=None):
+        self.done += done - self.phaseDone
+        self.phaseDone = done
+        self.lastDetail = detail
+        now = time.monotonic()
+        if now - self.lastReport < self.interval:
+            return
+        self.lastReport = now
+        self.report(now, detail)
+
+    def report (self, now, detail=None):
+        if self.stream is None:
+            return
+        elapsed = now - self.phaseStarted
+        rate = self.phaseDone / elapsed if elapsed > 0 else 0.0
+        line = "{0:<10} {1} iterations, {2:.0f} it/s".format(self.current, self.phaseDone, rate)
+        if self.total:
+            line += ", {0:.1f} %".format(100 * self.phaseDone / self.total)
+            if rate > 0:
+                line += ", ETA {0:.0f}s".format((self.total - self.phaseDone) / rate)
+        if detail:
+            line += ", " + detail
+        print(line, file=self.stream, flush=True)
+
+    # Finish Function
+    #
+    # Close the last phase and return the run summary: wall and CPU time
+    # (including finished worker processes), iterations and per-phase times.
+
+    def finish (self):
+        self.phase(None)
+        wall = time.monotonic() - self.started
+        return {
+            'wallTime': round(wall, 3),
+            'cpuTime': round(cpuTime() - self.cpuStarted, 3),
+            'iterations': self.done,
+            'iterationsPerSecond': round(self.done / wall, 1) if wall > 0 else 0.0,
+            'phases': {name: round(seconds, 3) for name, seconds in self.phases.items()}
+        }
+
+# CPU Time Function
+#
+# User and system time of this process and its reaped children.
+
+def cpuTime ():
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+# Write Summary Function
+#
+# Print the summary as one JSON line, and save it to path if given.
+
+def writeSummary (summary, path=None, stream=sys.stdout):
+    print(json.dumps(summary), file=stream, flush=True)
+    if path is not None:
+        with open(path, "w") as summaryFile:
+            json.dump(summary, summaryFile, indent=4)
@@ -0,0 +1,84 @@
+'''
+    Projection Cache
+
+    2017 Jacob Grishey
+
+    For the purpose of skipping a projection when nothing
+    it depends on has changed since the last run.
+'''
+
+# IMPORTS
+
+import os
+import json
+import hashlib
+import numpy
+from pathlib import Path
+from atomicfile import writeFile
+
+# Projections kept per season, most recently used first
+
+KEEP = 5
+
+# Bump when the stored results change shape, so older entries are not reused.
+
+FORMAT_VERSION = 1
+
+# Input Key Function
+#
+# Given a GameTable and the other inputs of a run, JSON serializable, return
+# a SHA-256 of them all. The season is hashed by its game columns, so the
+# same games give the same key whether they came as JSON or compiled.
+
+def inputKey (games, inputs):
+    digest = hashlib.sha256()
+    for column in (games.date, games.home, games.away, games.homeGoals, games.awayGoals,
+                    games.resultType, games.gameType):
+        digest.update(numpy.ascontiguousarray(column, dtype=numpy.int64).tobytes())
+    digest.update(json.dumps([FORMAT_VERSION, inputs], sort_keys=True).encode())
+    return digest.hexdigest()
+
+# Projection Cache
+#
+# One season's stored projections under directory/projections, one file per
+# input key. Reading an entry marks it as used; storing one evicts all but
+# the keep most recently used of the season.
+
+class ProjectionCache:
+    def __init__ (self, season, directory, keep=KEEP):
+        self.season = season
+        self.directory = Path(directory) / "projections"
+        self.keep = keep
+
+    def path (self, key):
+        return self.directory / "season{0}-{1}.json".format(self.season, key[:16])
+
+    # Get Function
+    #
+    # The entry stored under key, or None.
+
+    def get (self, key):
+        path = self.path(key)
+        try:
+            with open(path) as entryFile:
+                entry = json.load(entryFile)
+        except (OSError, ValueError):
+            return None
+
+        if entry.get('key') != key:
+            return None
+        os.utime(path)
+        return entry
+
+    def put (self, key, entry):
+        writeFile(self.path(key), json.dumps(dict(entry, key=key)))
+        self.evict()
+
+    def evict (self):
+        entries = sorted(self.directory.glob("season{0}-*.json".format(self.season)),
+                            key=lambda path: path.stat().st_mtime_ns, reverse=True)
+        for path in entries[self.keep:]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
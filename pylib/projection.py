@@ -0,0 +1,665 @@
+'''
+    Season Projection
+
+    2017 Jacob Grishey
+
+    For the purpose of simulating sports seasons
+    and determining regular season standings, as a library:
+    season data and prior ratings in, results out.
+'''
+
+# IMPORTS
+
+import datetime
+import time
+import numpy
+from collections import namedtuple
+from multiprocessing import Pool
+import vecsim
+from progress import Progress
+from profiling import PhaseProfile
+from distributions import Histograms
+from projcache import inputKey
+from gametable import GameTable, REG, SO
+from series import sampleSeries
+from bracket import ROUND_RESULTS, seedPlayoffs, seedBatch, conferencePlaces, pairRound, advanceBracket, propagateBracket
+from teams import TEAMS, TEAM_IDS, DIVISION_NAMES, RESULT_KEYS, RESULT_COLUMNS, franchise, newTable, newCounters
+
+# Iterations of a fixed run. Counts are always published out of this many
+# simulations, whatever number was actually run.
+
+ITERATIONS = 100000
+BATCH_SIZE = 1000
+SHARDS_PER_WORKER = 4
+
+# Results whose precision decides when an adaptive run can stop
+
+PLAYOFF_KEYS = ['d1', 'd2', 'd3', 'wc1', 'wc2']
+
+# Elo model: K-factor, and the weight of a playoff game relative to a regular
+# season one. calibrate.py scores other values of these, and of the overtime
+# model in vecsim.py, against past seasons.
+
+K_FACTOR = 8
+PLAYOFF_IMPORTANCE = 1.5
+
+# Expected Score function
+#
+# Given elo of team A and team B, calculate expected score of team A.
+
+def expectedScoreA (eloA, eloB):
+    return 1 / (1 + 10 ** ((eloB - eloA) / 400))
+
+# New Rating Function
+#
+# Given Elo, actual score, expected score, and goal differential and calculate the team's new Elo rating.
+
+def newRating (eloA, eloB, scoreActual, scoreExpected, goalDifferential, gameType):
+    # K-Factor
+    K = K_FACTOR
+
+    # Importance
+    I = PLAYOFF_IMPORTANCE if gameType == "P" else 1.0
+
+    # Calculate for goal differential and autocorrelation
+    marginMult = numpy.log(goalDifferential + 1) * (2.2 / (abs(eloA - eloB) * 0.01 + 2.2))
+
+    # Return new rating
+    return eloA + (marginMult * K * I) * (scoreActual - scoreExpected)
+
+# Carry Over Function
+#
+# Given last season's final results, return this season's starting Elo of each
+# team, regressed a third of the way back to 1500.
+
+def carryOver (lastSeason):
+    return regressRatings({franchise(team['name']): team['elo'] for team in lastSeason})
+
+def regressRatings (ratings):
+    return {name: (elo - 1500) * (2 / 3) + 1500 for name, elo in ratings.items()}
+
+# Process Game Function
+#
+# Given a completed regular season game, update the records and Elo ratings of
+# both teams. Returns the home team's expected score going into the game.
+
+def processGame (game, teams):
+    home = game.home
+    away = game.away
+
+    # Current Elo ratings
+    currentEloA = teams.elo[home]
+    currentEloB = teams.elo[away]
+
+    # Get Expected Scores
+    eA = expectedScoreA(currentEloA, currentEloB)
+    eB = 1 - eA
+
+    # Get scores
+    homeGoals = game.homeGoals
+    awayGoals = game.awayGoals
+    goalDifferential = abs(homeGoals - awayGoals)
+
+    # Get Actual Scores
+    if homeGoals > awayGoals:
+        winner, loser = home, away
+        sA = 1.0
+        sB = 0.5 if game.resultType != REG else 0.0
+    else:
+        winner, loser = away, home
+        sA = 0.5 if game.resultType != REG else 0.0
+        sB = 1.0
+
+    teams.w[winner] += 1
+    if game.resultType != SO:
+        teams.row[winner] += 1
+    if game.resultType != REG:
+        teams.otl[loser] += 1
+    else:
+        teams.l[loser] += 1
+
+    # Calculate new Elo ratings
+    newA = newRating(currentEloA, currentEloB, sA, eA, goalDifferential, "R")
+    newB = newRating(currentEloB, currentEloA, sB, eB, goalDifferential, "R")
+
+    # Apply Elo ratings
+    teams.elo[home] = newA
+    teams.elo[away] = newB
+
+    return eA
+
+# Sim Round Function
+#
+# Draw the final score of every unfinished series of a round, one draw each.
+
+def simRound (roundSeries, elo, rng):
+    for series in roundSeries:
+        if series['hWins'] < 4 and series['aWins'] < 4:
+            series['hWins'], series['aWins'] = sampleSeries(elo[series['home']], elo[series['away']],
+                                                            series['hWins'], series['aWins'], rng)
+
+# Replay Playoffs Function
+#
+# Given the seeded brackets and past playoff games, go through the games round
+# by round, updating Elo ratings and series. Returns the round in progress
+# (5 when the playoffs are over), its series, the brackets going into it and
+# the winners of every completed round.
+
+def replayPlayoffs (teams, brackets, pts, row, pastPO):
+    completed = []
+
+    for roundNumber in range(1, 5):
+        roundSeries = pairRound(roundNumber, brackets, pts, row)
+
+        for game in pastPO:
+            home = game.home
+            away = game.away
+
+            # Get series data
+            series = next((item for item in roundSeries if {item['home'], item['away']} == {home, away}), None)
+
+            if series is None:
+                continue
+
+            # Current Elo ratings of both teams
+            homeElo = teams.elo[home]
+            awayElo = teams.elo[away]
+
+            # Win probabilities
+            eA = expectedScoreA(homeElo, awayElo)
+            eB = 1 - eA
+
+            # Get scores
+            homeGoals = game.homeGoals
+            awayGoals = game.awayGoals
+            goalDifferential = abs(homeGoals - awayGoals)
+
+            # Get actual scores
+            homeWon = homeGoals > awayGoals
+            loserScore = 0.5 if game.resultType != REG else 0.0
+            sA = 1.0 if homeWon else loserScore
+            sB = loserScore if homeWon else 1.0
+
+            if homeWon == (home == series['home']):
+                series['hWins'] += 1
+            else:
+                series['aWins'] += 1
+
+            # Calculate new Elo ratings
+            newA = newRating(homeElo, awayElo, sA, eA, goalDifferential, "P")
+            newB = newRating(awayElo, homeElo, sB, eB, goalDifferential, "P")
+
+            # Apply Elo ratings
+            teams.elo[home] = newA
+            teams.elo[away] = newB
+
+        # Stop at the first round not finished with past games
+        if any(series['hWins'] != 4 and series['aWins'] != 4 for series in roundSeries):
+            return roundNumber, roundSeries, brackets, completed
+
+        winners, brackets = advanceBracket(roundSeries, brackets)
+        completed.append(winners)
+
+    return 5, [], brackets, completed
+
+# Baseline
+#
+# Everything decided by completed games, computed once per run and shared by
+# every simulation: Elo ratings and records after the past regular season
+# and, once the regular season is over, the seeding and playoff series so far.
+# Frozen dicts become tuples of (key, value) pairs, so the baseline also
+# pickles to pool workers.
+
+Baseline = namedtuple('Baseline', ['elo', 'records', 'seeding', 'roundNumber', 'series', 'brackets', 'completed'])
+
+def freeze (value):
+    if isinstance(value, dict):
+        return tuple((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+def buildBaseline (teams, pastPO, regularSeasonOver):
+    records = numpy.stack([teams.w, teams.l, teams.otl, teams.row], axis=1).tolist()
+
+    if not regularSeasonOver:
+        seeding, roundNumber, roundSeries, brackets, completed = None, 1, None, None, []
+    else:
+        pts = (teams.w * 2 + teams.otl).tolist()
+        row = teams.row.tolist()
+        brackets, seeding = seedPlayoffs(pts, row)
+        roundNumber, roundSeries, brackets, completed = replayPlayoffs(teams, brackets, pts, row, pastPO)
+
+    return Baseline(freeze(teams.elo.tolist()), freeze(records), freeze(seeding), roundNumber,
+                    freeze(roundSeries), freeze(brackets), freeze(completed))
+
+# Season State
+#
+# What every simulation of a season needs: the baseline, the team table after
+# completed games, whether the regular season is over, and the remaining
+# regular season games as team ids with the home team's win probability.
+
+SeasonState = namedtuple('SeasonState', ['baseline', 'table', 'playoffs', 'futureHome', 'futureAway',
+                                            'futureProb', 'todaysGames'])
+
+# Prepare Function
+#
+# Given the season, as games, compiled or a GameTable, starting Elo ratings by
+# team name and today's date, replay completed games once and return the
+# season state.
+
+def prepare (season, priorRatings=None, today=None):
+    today = today or datetime.date.today().strftime("%Y-%m-%d")
+    games = season if isinstance(season, GameTable) else GameTable(season)
+
+    table = newTable()
+
+    for name, elo in (priorRatings or {}).items():
+        table.elo[TEAM_IDS[franchise(name)]] = elo
+
+    todaysGames = []
+    isToday = set(games.onDate(today).tolist())
+
+    def addToday (i, eA):
+        newGame = {
+            'homeTeam': TEAMS[games.home[i]],
+            'awayTeam': TEAMS[games.away[i]],
+            'homeProb': float(eA),
+            'awayProb': float(1 - eA)
+        }
+        todaysGames.append(newGame) if newGame not in todaysGames else ()
+
+    # Update elo from regular season games
+    for i in games.pastReg.tolist():
+        eA = processGame(games.game(i), table)
+        if i in isToday:
+            addToday(i, eA)
+
+    playoffs = len(games.futureReg) == 0
+    baseline = buildBaseline(table, [games.game(i) for i in games.pastPO.tolist()], playoffs)
+    table.elo[:] = baseline.elo
+
+    # Ratings going into the remaining regular season games.
+    futureHome = games.home[games.futureReg]
+    futureAway = games.away[games.futureReg]
+    futureProb = vecsim.expectedScores(table.elo[futureHome], table.elo[futureAway])
+
+    for i, eA in zip(games.futureReg.tolist(), futureProb):
+        if i in isToday:
+            addToday(i, eA)
+
+    return SeasonState(baseline, table, playoffs, futureHome, futureAway, futureProb, todaysGames)
+
+# Record Results Function
+#
+# Add the given result of every listed team to hits, as flat indexes into the
+# counters matrix. Hits are added to the counters a batch at a time.
+
+def recordResults (hits, result, ids):
+    column = RESULT_COLUMNS[result]
+    hits.extend(team * len(RESULT_KEYS) + column for team in ids)
+
+def addHits (counters, hits):
+    counters += numpy.bincount(hits, minlength=counters.size).reshape(counters.shape)
+
+# Decided Results Function
+#
+# The results already decided by completed games, the same in every
+# simulation: seeding once the regular season is over and the winners of
+# completed playoff rounds, as counters of one simulation.
+
+def decidedResults (baseline):
+    decided = newCounters()
+    hits = []
+
+    for result, ids in baseline.seeding or ():
+        recordResults(hits, result, ids)
+
+    for roundNumber, winners in enumerate(baseline.completed, 1):
+        recordResults(hits, ROUND_RESULTS[roundNumber - 1], winners)
+
+    addHits(decided, hits)
+    return decided
+
+# Run Season Function
+#
+# Play the rest of the playoffs of one simulation, given its final points and
+# ROW by team id and its brackets as seeded for the whole batch, or None once
+# the baseline holds them. The round winners are added to hits. rng is the
+# random stream the playoffs are drawn from. Phases are timed into profile,
+# if given.
+
+def runSeason (state, hits, pts, row, brackets, rng, profile=None):
+    baseline = state.baseline
+    mark = time.perf_counter() if profile is not None else None
+
+    if baseline.seeding is None:
+        roundSeries = None
+    else:
+        brackets = baseline.brackets
+        roundSeries = [dict(series) for series in baseline.series]
+
+    # Play the rest of the playoffs
+    for roundNumber in range(baseline.roundNumber, 5):
+        if roundSeries is None:
+            roundSeries = pairRound(roundNumber, brackets, pts, row)
+
+        simRound(roundSeries, baseline.elo, rng)
+
+        winners, brackets = advanceBracket(roundSeries, brackets)
+        recordResults(hits, ROUND_RESULTS[roundNumber - 1], winners)
+        roundSeries = None
+
+        if profile is not None:
+            mark = profile.lap('round' + str(roundNumber), mark)
+
+# Exact Playoffs Function
+#
+# Once the regular season is over, fill the counters with the exact playoff
+# odds instead of simulating, scaled to ITERATIONS like simulated counts. The
+# final standings are known, so every histogram gets a single value per team.
+
+def exactPlayoffs (state, counters, histograms):
+    baseline = state.baseline
+    w, l, otl, row = [list(column) for column in zip(*baseline.records)]
+    pts = [wins * 2 + overtimeLosses for wins, overtimeLosses in zip(w, otl)]
+    decided = decidedResults(baseline)
+    decided[:, :3] = numpy.array(baseline.records)[:, :3]
+    counters += decided * ITERATIONS
+
+    histograms.add('pts', numpy.array([pts]), ITERATIONS)
+    histograms.add('w', numpy.array([w]), ITERATIONS)
+    histograms.add('place', conferencePlaces([pts], [row]), ITERATIONS)
+
+    odds = propagateBracket(baseline.roundNumber, [dict(series) for series in baseline.series],
+                            baseline.brackets, baseline.elo, pts, row)
+
+    for result, probs in odds.items():
+        for team, prob in probs.items():
+            counters[team, RESULT_COLUMNS[result]] += round(prob * ITERATIONS)
+
+# Make Batches Function
+#
+# Split iterations into batches of at most BATCH_SIZE, each with its own child
+# of seedSequence as (size, seed) pairs. Children are spawned in order, so the
+# k-th batch of a run always gets the same stream, however the batches are
+# made and spread over workers.
+
+def makeBatches (iterations, seedSequence):
+    sizes = [min(BATCH_SIZE, iterations - start) for start in range(0, iterations, BATCH_SIZE)]
+    return list(zip(sizes, seedSequence.spawn(len(sizes))))
+
+# Run Simulations Function
+#
+# Simulate the given batches, each on its own random stream. The remaining
+# regular season, final standings and seeding of a whole batch are done at
+# once, and added to counters with the results already decided, and to
+# histograms; only the playoffs are played one simulation at a time. Progress
+# is reported to report and phases timed into profile, if given.
+
+def runSimulations (state, counters, histograms, batches, report, profile=None):
+    baseline = state.baseline
+    pastRecords = numpy.array(baseline.records)
+    decided = decidedResults(baseline)
+    done = 0
+
+    for batchSize, batchSeed in batches:
+        rng = numpy.random.default_rng(batchSeed)
+        mark = time.perf_counter() if profile is not None else None
+        records = pastRecords + numpy.stack(vecsim.simRegularSeason(state.futureHome, state.futureAway,
+                                            state.futureProb, len(TEAMS), batchSize, rng), axis=2)
+        if profile is not None:
+            mark = profile.lap('regular', mark)
+
+        # Final standings, records as (simulations x teams x [w, l, otl, row])
+        counters[:, :3] += records[:, :, :3].sum(axis=0)
+        pts = records[:, :, 0] * 2 + records[:, :, 2]
+        row = records[:, :, 3]
+        histograms.add('pts', pts)
+        histograms.add('w', records[:, :, 0])
+        histograms.add('place', conferencePlaces(pts, row))
+        if profile is not None:
+            mark = profile.lap('standings', mark)
+
+        if baseline.seeding is None:
+            brackets, seeding = seedBatch(pts, row)
+            for result, ids in seeding.items():
+                counters[:, RESULT_COLUMNS[result]] += numpy.bincount(ids.ravel(), minlength=len(TEAMS))
+            brackets = brackets.tolist()
+        else:
+            brackets = [None] * batchSize
+        counters += decided * batchSize
+        if profile is not None:
+            profile.lap('seeding', mark)
+
+        hits = []
+        for season in zip(pts.tolist(), row.tolist(), brackets):
+            runSeason(state, hits, *season, rng, profile)
+            done += 1
+            if report is not None:
+                report.update(done)
+        addHits(counters, hits)
+
+# Run Shard Function
+#
+# Worker side of a parallel run. Given the season state, batches and whether
+# to profile, simulate them and return their counters, histograms and phase
+# profile. The state travels with every shard, a few kilobytes, so one pool
+# can serve runs on different seasons.
+
+def runShard (shard):
+    state, batches, profiled = shard
+    counters = newCounters()
+    histograms = Histograms()
+    profile = PhaseProfile() if profiled else None
+
+    runSimulations(state, counters, histograms, batches, None, profile)
+
+    return counters, histograms, profile
+
+# Run Parallel Function
+#
+# Given a pool, the season state, batches and a number of shards, hand the
+# batches out to the workers in up to numShards runs of consecutive batches.
+# Adds the merged counts into counters and histograms, and the workers' phase
+# profiles into profile if given. Counts are whole numbers, so the totals are
+# the same in any order.
+
+def runParallel (pool, state, counters, histograms, batches, numShards, report, profile=None):
+    done = 0
+    shards = [batches[len(batches) * i // numShards:len(batches) * (i + 1) // numShards] for i in range(numShards)]
+    shards = [shard for shard in shards if shard]
+
+    for shard, (counts, shardHistograms, shardProfile) in zip(shards, pool.imap(runShard,
+                                                                [(state, shard, profile is not None) for shard in shards])):
+        counters += counts
+        histograms.merge(shardHistograms)
+        if profile is not None:
+            profile.merge(shardProfile)
+        done += sum(batchSize for batchSize, batchSeed in shard)
+        if report is not None:
+            report.update(done)
+
+# Standard Errors Function
+#
+# Given counts of a result over some iterations, return the standard error of
+# each team's probability. Laplace smoothing keeps results never seen yet from
+# looking perfectly precise.
+
+def standardErrors (counts, iterations):
+    prob = (counts + 1) / (iterations + 2)
+    return numpy.sqrt(prob * (1 - prob) / iterations)
+
+def worstError (counters, iterations):
+    playoffs = counters[:, [RESULT_COLUMNS[key] for key in PLAYOFF_KEYS]].sum(axis=1)
+    return max(standardErrors(counts, iterations).max()
+                for counts in [playoffs, counters[:, RESULT_COLUMNS['cup']], counters[:, RESULT_COLUMNS['pres']]])
+
+# Run Adaptive Function
+#
+# Simulate a batch per worker at a time until every team's playoff, cup and
+# Presidents' Trophy probability has a standard error within precision, the
+# time budget runs out or maxIterations is reached, the last round cut short
+# so as not to go past it. Returns the iterations run.
+
+def runAdaptive (state, counters, histograms, pool, workers, seedSequence, precision, timeBudget, maxIterations,
+                    progress, profile=None):
+    started = time.time()
+    iterations = 0
+
+    while iterations < maxIterations:
+        roundSize = min(BATCH_SIZE * workers, maxIterations - iterations)
+        batches = makeBatches(roundSize, seedSequence)
+        if pool is None:
+            runSimulations(state, counters, histograms, batches, None, profile)
+        else:
+            runParallel(pool, state, counters, histograms, batches, workers, None, profile)
+        iterations += roundSize
+
+        error = worstError(counters, iterations)
+        progress.update(iterations, "worst standard error {0:.5f}".format(error))
+
+        if precision is not None and error <= precision:
+            break
+        if timeBudget is not None and time.time() - started >= timeBudget:
+            break
+
+    return iterations
+
+# Team Results Function
+#
+# Given the state, counters, histograms and iterations run, return the
+# per-team results in the shape of the results files, counts out of
+# ITERATIONS. dist holds each team's distribution of final points, wins and
+# conference place as counts from the lowest value seen, and pctl their
+# PERCENTILES.
+
+def teamResults (state, counters, histograms, iterations, exact):
+    table = state.table
+    teamsData = []
+    scale = ITERATIONS / iterations
+    averages = (counters[:, :3] / iterations).tolist()
+    counts = (counters[:, 3:] * scale).round().astype(numpy.int64).tolist()
+    errors = (standardErrors(counters[:, 3:], iterations) * ITERATIONS).tolist()
+    distributions = histograms.report(scale)
+
+    for team, name in enumerate(TEAMS):
+        teamData = {'name': name, 'w': int(table.w[team]), 'l': int(table.l[team]), 'otl': int(table.otl[team]),
+                    'row': int(table.row[team]), 'elo': float(table.elo[team])}
+        teamData.update(zip(RESULT_KEYS[:3], averages[team]))
+        teamData.update(zip(RESULT_KEYS[3:], counts[team]))
+        teamData['division'] = DIVISION_NAMES[team]
+        teamData['se'] = {key: 0.0 if exact else round(error, 1) for key, error in zip(RESULT_KEYS[3:], errors[team])}
+        teamData['dist'], teamData['pctl'] = distributions[team]
+        teamsData.append(teamData)
+
+    return teamsData
+
+# Projection
+#
+# Result of a run: the snapshot appended to the results history, today's games
+# with their win probabilities, and the run summary.
+
+Projection = namedtuple('Projection', ['snapshot', 'todaysGames', 'summary'])
+
+# Project Function
+#
+# Given the season's games and starting Elo ratings by team name, simulate the
+# rest of the season and return the projection. Runs ITERATIONS simulations
+# by default, split across workers processes if more than one. precision and
+# timeBudget switch to an adaptive run capped at iterations; exact computes
+# playoff odds instead of simulating once the regular season is over.
+#
+# Every batch of simulations draws from its own child stream of seed, so the
+# same seed and data give bit-identical results with any number of workers.
+# An adaptive run checks precision after every round of one batch per worker,
+# so there the number of iterations, and with it the results, depends on the
+# worker count. Without a seed, fresh entropy is used and recorded in the
+# summary as 'seed' to repeat the run. With profile, the summary includes the
+# time spent in each phase of the simulated seasons.
+#
+# Given a ProjectionCache, a run with the same games, ratings, model and
+# options as a stored one returns its results instead of simulating, with
+# 'cached' set in the summary. An unseeded run is stored under seed None and
+# reused like any other; runs with a time budget or profile never are.
+#
+# A long-running caller can pass its own pool of workers processes, which is
+# used and left open; otherwise one is started for the run when workers > 1.
+
+def project (season, priorRatings=None, iterations=ITERATIONS, seed=None, workers=1, exact=False,
+                precision=None, timeBudget=None, today=None, progress=None, profile=False, cache=None, pool=None):
+    today = today or datetime.date.today().strftime("%Y-%m-%d")
+    progress = progress or Progress(stream=None)
+    profile = PhaseProfile() if profile else None
+
+    progress.phase("baseline")
+    mark = time.perf_counter()
+    games = season if isinstance(season, GameTable) else GameTable(season)
+    state = prepare(games, priorRatings, today)
+    if profile is not None:
+        profile.lap('replay', mark)
+
+    if cache is not None and timeBudget is None and profile is None:
+        # Adaptive runs stop at a number of iterations that depends on workers.
+        key = inputKey(games, [K_FACTOR, PLAYOFF_IMPORTANCE, vecsim.OT_RATE, vecsim.SO_RATE, ITERATIONS, BATCH_SIZE,
+                                priorRatings, iterations, seed, exact, precision,
+                                workers if precision is not None else None])
+        entry = cache.get(key)
+        if entry is not None:
+            summary = progress.finish()
+            summary.update(seed=entry['seed'], cached=True)
+            snapshot = {"date": today, "playoffs": entry['playoffs'], "iterations": entry['iterations'],
+                        "data": entry['data']}
+            return Projection(snapshot, {"date": today, "data": state.todaysGames}, summary)
+    else:
+        key = None
+
+    counters = newCounters()
+    histograms = Histograms()
+    seedSequence = numpy.random.SeedSequence(seed)
+    exact = exact and state.playoffs
+
+    ownPool = None
+    if exact:
+        pool = None
+    elif pool is None and workers > 1:
+        pool = ownPool = Pool(workers)
+
+    if exact:
+        progress.phase("exact")
+        exactPlayoffs(state, counters, histograms)
+        iterations = ITERATIONS
+    elif precision is not None or timeBudget is not None:
+        progress.phase("simulate", iterations)
+        iterations = runAdaptive(state, counters, histograms, pool, max(workers, 1), seedSequence, precision, timeBudget,
+                                    iterations, progress, profile)
+    elif pool is not None:
+        progress.phase("simulate", iterations)
+        runParallel(pool, state, counters, histograms, makeBatches(iterations, seedSequence), workers * SHARDS_PER_WORKER,
+                    progress, profile)
+    else:
+        progress.phase("simulate", iterations)
+        runSimulations(state, counters, histograms, makeBatches(iterations, seedSequence), progress, profile)
+
+    if ownPool is not None:
+        ownPool.close()
+        ownPool.join()
+
+    progress.phase("results")
+    snapshot = {
+        "date": today,
+        "playoffs": state.playoffs,
+        "iterations": iterations,
+        "data": teamResults(state, counters, histograms, iterations, exact)
+    }
+
+    summary = progress.finish()
+    summary['seed'] = seedSequence.entropy
+    if profile is not None:
+        summary['profile'] = profile.report()
+
+    if key is not None:
+        cache.put(key, {'seed': seedSequence.entropy, 'playoffs': snapshot['playoffs'],
+                        'iterations': iterations, 'data': snapshot['data']})
+
+    return Projection(snapshot, {"date": today, "data": state.todaysGames}, summary)
@@ -5,20 +5,59 @@
 # Imports
 
 import json
+import time
+import random
+import datetime
 import argparse
+import functools
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from season import replaceDates, loadSeason, saveSeason
+from apicache import ResponseCache
 
-parser = argparse.ArgumentParser()
+API = "https://statsapi.web.nhl.com/api/v1"
+SCHEDULE_PATH = "/schedule?startDate={0}&endDate={1}&expand=schedule.linescore&site=en_nhl"
 
-parser.add_argument('--dfrom')
-parser.add_argument('--dto')
-parser.add_argument('--out')
+# Backfill defaults: days per request, requests in flight, attempts per window
+# and the first retry delay in seconds, doubled on every retry.
 
-args = parser.parse_args()
+WINDOW_DAYS = 14
+FETCH_WORKERS = 8
+RETRIES = 4
+BACKOFF = 1.0
 
-def getGames (dfrom, dto):
-    url = "https://statsapi.web.nhl.com/api/v1/schedule?startDate={0}&endDate={1}&expand=schedule.linescore&site=en_nhl".format(dfrom, dto)
-    jsondata = json.loads(urllib.request.urlopen(url).read().decode())
+# Fetch Schedule Function
+#
+# Return the schedule API response for the given dates. api is the base URL,
+# so a local server can stand in for the real one. With a ResponseCache the
+# raw response is kept, and reused while fresh.
+
+def fetchSchedule (dfrom, dto, api=API, timeout=30, cache=None):
+    url = api + SCHEDULE_PATH.format(dfrom, dto)
+
+    def download ():
+        return urllib.request.urlopen(url, timeout=timeout).read()
+
+    if cache is not None:
+        return cache.get(url, dto, download)
+    return json.loads(download().decode())
+
+# Fixture Schedule
+#
+# Stand-in for the API that answers from a recorded response, keeping only the
+# requested dates like the API would.
+
+def fixtureSchedule (path):
+    with open(path) as fixtureFile:
+        recorded = json.load(fixtureFile)
+
+    def fetch (dfrom, dto):
+        return {'dates': [date for date in recorded['dates'] if dfrom <= date['date'] <= dto]}
+
+    return fetch
+
+def getGames (dfrom, dto, fetch=fetchSchedule):
+    jsondata = fetch(dfrom, dto)
     dates = jsondata['dates']
     games = []
     for date in dates:
@@ -46,7 +85,119 @@ def getGames (dfrom, dto):
                                 'homeGoals': 0, 'awayGoals': 0})
     return games
 
-schedule = getGames(args.dfrom, args.dto)
+# Update Season Function
+#
+# Given the games already scraped, fetch only from the earliest game still to
+# be decided, or the last date on file if none is, up to dto (the end of the
+# season if not given). The fetched dates replace the season's games on them,
+# so games added to the schedule are picked up and games taken off it are
+# dropped. Returns the updated season and how many games changed.
+
+def updateSeason (season, dto=None, fetch=fetchSchedule):
+    if not season:
+        return season, 0
+
+    dates = [game['date'] for game in season]
+    pending = [game['date'] for game in season if game['resultType'] == "TBD"]
+    dfrom = min(pending) if pending else max(dates)
+    dto = dto or seasonDates(seasonOf(min(dates)))[1]
+
+    if dfrom > dto:
+        return season, 0
+
+    return replaceDates(season, getGames(dfrom, dto, fetch), dfrom, dto)
+
+# Windows Function
+#
+# Split the dates from dfrom to dto into consecutive windows of at most days
+# days, as (start, end) pairs of dates.
+
+def windows (dfrom, dto, days=WINDOW_DAYS):
+    start = datetime.date.fromisoformat(dfrom)
+    last = datetime.date.fromisoformat(dto)
+    spans = []
+    while start <= last:
+        end = min(start + datetime.timedelta(days=days - 1), last)
+        spans.append((start.isoformat(), end.isoformat()))
+        start = end + datetime.timedelta(days=1)
+    return spans
+
+# Get Games With Retry Function
+#
+# getGames for one window, retrying failed requests and unreadable responses
+# with exponential backoff and a little jitter.
+
+def getGamesWithRetry (dfrom, dto, fetch=fetchSchedule, retries=RETRIES, backoff=BACKOFF):
+    for attempt in range(retries):
+        try:
+            return getGames(dfrom, dto, fetch)
+        except (OSError, ValueError, KeyError):
+            if attempt == retries - 1:
+                raise
+            time.sleep(backoff * 2 ** attempt + random.uniform(0, backoff))
+
+# Backfill Function
+#
+# Given date ranges as (dfrom, dto) pairs, fetch every range a window at a time
+# with at most workers requests in flight, and return each range's games in
+# date order.
+
+def backfill (ranges, fetch=fetchSchedule, days=WINDOW_DAYS, workers=FETCH_WORKERS, retries=RETRIES, backoff=BACKOFF):
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = [[pool.submit(getGamesWithRetry, start, end, fetch, retries, backoff)
+                    for start, end in windows(dfrom, dto, days)] for dfrom, dto in ranges]
+        return [[game for window in futures for game in window.result()] for futures in pending]
+
+# Season Dates Function
+#
+# Dates to scrape for a season like "2013-14": October through June.
+
+def seasonDates (season):
+    year = int(season[:4])
+    return ("{0}-10-01".format(year), "{0}-06-30".format(year + 1))
+
+# Season Of Function
+#
+# The season, like "2013-14", a date falls in. Seasons start in the summer.
+
+def seasonOf (date):
+    year = int(date[:4]) if date[5:7] >= "07" else int(date[:4]) - 1
+    return "{0}-{1:02d}".format(year, (year + 1) % 100)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('--dfrom')
+    parser.add_argument('--dto')
+    parser.add_argument('--out')
+    parser.add_argument('--incremental', action='store_true')
+    parser.add_argument('--fixture')
+    parser.add_argument('--api', default=API)
+    parser.add_argument('--backfill', nargs='+', metavar='SEASON')
+    parser.add_argument('--window', type=int, default=WINDOW_DAYS)
+    parser.add_argument('--threads', type=int, default=FETCH_WORKERS)
+    parser.add_argument('--cache', default="./../cache")
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--offline', action='store_true')
+
+    args = parser.parse_args()
+
+    cache = None if args.no_cache else ResponseCache(args.cache, offline=args.offline)
+    fetch = fixtureSchedule(args.fixture) if args.fixture else functools.partial(fetchSchedule, api=args.api, cache=cache)
+
+    if args.backfill:
+        # Whole seasons, e.g. --backfill 2013-14 2014-15, one file each
+        seasons = backfill([seasonDates(season) for season in args.backfill], fetch, args.window, args.threads)
+        for season, games in zip(args.backfill, seasons):
+            saveSeason('./../data/season{0}.json'.format(season), games)
+            print("season{0}.json: {1} games".format(season, len(games)))
+    elif args.incremental:
+        season, changed = updateSeason(loadSeason('./../data/' + args.out), args.dto, fetch)
+        print("{0} games updated".format(changed))
+        if changed:
+            saveSeason('./../data/' + args.out, season)
+    else:
+        schedule = getGames(args.dfrom, args.dto, fetch)
 
-with open('./../data/' + args.out, 'w') as outfile:
-    json.dump(schedule, outfile, indent=4)
+        with open('./../data/' + args.out, 'w') as outfile:
+            json.dump(schedule, outfile, indent=4)
@@ -0,0 +1,169 @@
+'''
+    Season Data
+
+    2017 Jacob Grishey
+
+    For the purpose of reading, updating and saving
+    the season files written by the scraper.
+'''
+
+# IMPORTS
+
+import re
+import json
+import io
+import hashlib
+import datetime
+import numpy
+from pathlib import Path
+from collections import namedtuple
+from atomicfile import writeFile
+
+CACHE_DIR = "./../cache"
+
+# Game Key Function
+#
+# A game is identified by its date and teams, scheduled or played.
+
+def gameKey (game):
+    return (game['date'], game['homeTeam'], game['awayTeam'])
+
+# Merge Games Function
+#
+# Given the games of a season and updated games, replace the games with the
+# same key and add the new ones, keeping the season in date order. Returns
+# the merged season and how many games changed.
+
+def mergeGames (season, games):
+    merged = {gameKey(game): game for game in season}
+    changed = 0
+
+    for game in games:
+        if merged.get(gameKey(game)) != game:
+            merged[gameKey(game)] = game
+            changed += 1
+
+    return sorted(merged.values(), key=lambda game: game['date']), changed
+
+# Replace Dates Function
+#
+# Given the games of a season and every game from dfrom to dto, both dates
+# included, replace the season's games on those dates with them. Games no
+# longer listed, like playoff games that turned out not to be needed, are
+# dropped. Returns the season in date order and how many games changed, were
+# added or were dropped.
+
+def replaceDates (season, games, dfrom, dto):
+    replaced = {gameKey(game): game for game in season if dfrom <= game['date'] <= dto}
+    fetched = {gameKey(game): game for game in games}
+
+    changed = sum(1 for key, game in fetched.items() if replaced.get(key) != game)
+    changed += sum(1 for key in replaced if key not in fetched)
+
+    kept = [game for game in season if not dfrom <= game['date'] <= dto]
+    return sorted(kept + list(fetched.values()), key=lambda game: game['date']), changed
+
+# Check Game Function
+#
+# Raise ValueError unless game is a game in the scraper's format: an ISO date,
+# team names, a game type, a result of REG, OT, SO, TBD or a numbered
+# overtime like 2OT, and whole, non-negative goals.
+
+GAME_FIELDS = ['date', 'gameType', 'resultType', 'homeTeam', 'awayTeam', 'homeGoals', 'awayGoals']
+GAME_TYPES = ["R", "P", "A"]
+RESULT_TYPE = re.compile(r"REG|OT|SO|TBD|[2-9]OT")
+
+def checkGame (game):
+    if not isinstance(game, dict) or sorted(game) != sorted(GAME_FIELDS):
+        raise ValueError("a game needs exactly the fields " + ", ".join(GAME_FIELDS))
+    if not isinstance(game['date'], str) or len(game['date']) != 10:
+        raise ValueError("bad date " + repr(game['date']))
+    datetime.date.fromisoformat(game['date'])
+    if game['gameType'] not in GAME_TYPES:
+        raise ValueError("bad gameType " + repr(game['gameType']))
+    if not isinstance(game['resultType'], str) or not RESULT_TYPE.fullmatch(game['resultType']):
+        raise ValueError("bad resultType " + repr(game['resultType']))
+    for team in [game['homeTeam'], game['awayTeam']]:
+        if not isinstance(team, str):
+            raise ValueError("bad team " + repr(team))
+    for goals in [game['homeGoals'], game['awayGoals']]:
+        if type(goals) is not int or goals < 0:
+            raise ValueError("bad goals " + repr(goals))
+
+# Load Season Function
+
+def loadSeason (path):
+    with open(path) as seasonFile:
+        return json.load(seasonFile)
+
+# Save Season Function
+#
+# Write the season in the scraper's format, replacing the old file only once
+# the new one is complete.
+
+def saveSeason (path, season):
+    writeFile(path, json.dumps(season, indent=4))
+
+# Compiled Season
+#
+# A season as one row per game of typed columns. Teams, game types and result
+# types are stored as indexes into the season's own sorted lists of names, and
+# dates as ordinals.
+
+GAME_DTYPE = numpy.dtype([('date', '<i4'), ('home', '<i2'), ('away', '<i2'), ('homeGoals', '<i2'),
+                            ('awayGoals', '<i2'), ('gameType', 'u1'), ('resultType', 'u1')])
+
+CompiledSeason = namedtuple('CompiledSeason', ['games', 'teams', 'gameTypes', 'resultTypes'])
+
+def compileSeason (season):
+    teams = sorted({game['homeTeam'] for game in season} | {game['awayTeam'] for game in season})
+    gameTypes = sorted({game['gameType'] for game in season})
+    resultTypes = sorted({game['resultType'] for game in season})
+
+    teamIds = {name: i for i, name in enumerate(teams)}
+    gameTypeIds = {name: i for i, name in enumerate(gameTypes)}
+    resultTypeIds = {name: i for i, name in enumerate(resultTypes)}
+
+    games = numpy.array([(datetime.date.fromisoformat(game['date']).toordinal(), teamIds[game['homeTeam']],
+                            teamIds[game['awayTeam']], game['homeGoals'], game['awayGoals'],
+                            gameTypeIds[game['gameType']], resultTypeIds[game['resultType']]) for game in season],
+                        dtype=GAME_DTYPE)
+
+    return CompiledSeason(games, teams, gameTypes, resultTypes)
+
+# Load Compiled Function
+#
+# Given the path of a season JSON file, return it compiled, loading the games
+# memory mapped from cacheDir. The compiled copy is rebuilt when the JSON
+# file's contents change; a changed mtime or size alone only costs a hash.
+
+def loadCompiled (path, cacheDir=CACHE_DIR):
+    source = Path(path)
+    arrayFile = Path(cacheDir) / (source.stem + ".npy")
+    metaFile = Path(cacheDir) / (source.stem + ".meta.json")
+
+    stat = source.stat()
+    try:
+        with open(metaFile) as meta:
+            meta = json.load(meta)
+    except (OSError, ValueError):
+        meta = None
+
+    current = (meta is not None and arrayFile.is_file()
+                and meta['mtime'] == stat.st_mtime_ns and meta['size'] == stat.st_size)
+
+    if not current:
+        data = source.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+
+        if meta is None or meta['sha256'] != digest or not arrayFile.is_file():
+            compiled = compileSeason(json.loads(data))
+            out = io.BytesIO()
+            numpy.save(out, compiled.games)
+            writeFile(arrayFile, out.getvalue())
+            meta = {'teams': compiled.teams, 'gameTypes': compiled.gameTypes, 'resultTypes': compiled.resultTypes}
+
+        meta.update({'sha256': digest, 'mtime': stat.st_mtime_ns, 'size': stat.st_size})
+        writeFile(metaFile, json.dumps(meta))
+
+    return CompiledSeason(numpy.load(arrayFile, mmap_mode='r'), meta['teams'], meta['gameTypes'], meta['resultTypes'])
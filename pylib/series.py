@@ -0,0 +1,83 @@
+'''
+    Series Probabilities
+
+    2017 Jacob Grishey
+
+    For the purpose of computing the exact outcome
+    probabilities of a best-of-seven playoff series.
+'''
+
+# IMPORTS
+
+import bisect
+from functools import lru_cache
+from vecsim import expectedScores
+
+# Home ice
+#
+# Venue of each game of a series for the higher seed (2-2-1-1-1). The Elo model
+# has no home-ice term, so the venue only matters with a nonzero advantage.
+
+HOME_ICE = "HHAAHAH"
+HOME_ADVANTAGE = 0
+
+# Final series scores, higher seed first: the four ways the higher seed wins,
+# then the four ways the lower seed wins.
+
+OUTCOMES = [(4, 0), (4, 1), (4, 2), (4, 3), (0, 4), (1, 4), (2, 4), (3, 4)]
+
+# Series outcome tables kept, least recently used dropped first. Ratings are
+# fixed through a run's playoffs, so one run needs at most a table per pair of
+# teams and series score; older runs' ratings fall out as new ones come in.
+
+CACHE_SIZE = 4096
+
+# Series Outcomes Function
+#
+# Given the Elo of the higher and lower seed and the current series score,
+# return the probability of each final score in OUTCOMES, by dynamic
+# programming over the series states still reachable.
+
+@lru_cache(maxsize=CACHE_SIZE)
+def seriesOutcomes (eloHigh, eloLow, hWins=0, aWins=0, pattern=HOME_ICE, homeAdvantage=HOME_ADVANTAGE):
+    # Win probability of the higher seed in each game of the series
+    gameProb = [float(expectedScores(eloHigh + homeAdvantage, eloLow)) if venue == "H"
+                else float(expectedScores(eloHigh, eloLow + homeAdvantage)) for venue in pattern]
+
+    # Probability of passing through each series state
+    reach = {(hWins, aWins): 1.0}
+
+    for played in range(hWins + aWins, 7):
+        for h in range(max(0, played - 3), min(played, 3) + 1):
+            a = played - h
+            if (h, a) not in reach:
+                continue
+            p = gameProb[played]
+            reach[(h + 1, a)] = reach.get((h + 1, a), 0.0) + reach[(h, a)] * p
+            reach[(h, a + 1)] = reach.get((h, a + 1), 0.0) + reach[(h, a)] * (1 - p)
+
+    return tuple(reach.get(outcome, 0.0) for outcome in OUTCOMES)
+
+# Series Win Probability Function
+#
+# Probability that the higher seed wins the series from the current score.
+
+def seriesWinProbability (eloHigh, eloLow, hWins=0, aWins=0, pattern=HOME_ICE, homeAdvantage=HOME_ADVANTAGE):
+    return sum(seriesOutcomes(eloHigh, eloLow, hWins, aWins, pattern, homeAdvantage)[:4])
+
+# Sample Series Function
+#
+# Draw a final series score with a single random number.
+
+def sampleSeries (eloHigh, eloLow, hWins, aWins, rng):
+    cumulative = cumulativeOutcomes(eloHigh, eloLow, hWins, aWins)
+    return OUTCOMES[min(bisect.bisect_right(cumulative, rng.random()), len(OUTCOMES) - 1)]
+
+@lru_cache(maxsize=CACHE_SIZE)
+def cumulativeOutcomes (eloHigh, eloLow, hWins, aWins):
+    total = 0.0
+    cumulative = []
+    for prob in seriesOutcomes(eloHigh, eloLow, hWins, aWins):
+        total += prob
+        cumulative.append(total)
+    return cumulative
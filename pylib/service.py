@@ -0,0 +1,268 @@
+'''
+    Projection Service
+
+    2017 Jacob Grishey
+
+    For the purpose of keeping the season and latest
+    projection in memory, serving current odds over HTTP
+    and updating them as soon as new results come in.
+'''
+
+# IMPORTS
+
+import json
+import datetime
+import threading
+import argparse
+from pathlib import Path
+from multiprocessing import Pool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingMixIn, UnixStreamServer
+import history
+import projection
+from season import checkGame, mergeGames, loadSeason, saveSeason
+from gametable import GameTable
+from atomicfile import writeFile
+from progress import Progress
+from teams import TEAM_IDS
+
+# Service
+#
+# Holds the season and the latest projection. Ingested games are merged into
+# the season and, if anything changed, the projection is recomputed on a
+# background thread while the previous one keeps being served. Results that
+# arrive during a recompute are folded into one more run when it finishes.
+# Once the date changes, the projection is recomputed for the new day.
+
+class Service:
+    def __init__ (self, season, priorRatings=None, options=None, record=None):
+        self.season = season
+        self.priorRatings = priorRatings
+        self.options = options or {}
+        self.record = record
+        self.lock = threading.Lock()
+        self.result = None
+        self.computedSeason = None
+        self.todaysGames = None
+        self.version = 0
+        self.computed = 0
+        self.stale = False
+        self.thread = None
+        self.error = None
+
+    # Ingest Function
+    #
+    # Merge updated games into the season. Returns how many changed. Malformed
+    # games and games of unknown teams are refused with ValueError, and the
+    # merged season must compile, before anything is kept.
+
+    def ingest (self, games):
+        if not isinstance(games, list):
+            raise ValueError("expected a list of games")
+
+        for game in games:
+            checkGame(game)
+            for team in [game['homeTeam'], game['awayTeam']]:
+                if team not in TEAM_IDS:
+                    raise ValueError("unknown team " + str(team))
+
+        with self.lock:
+            season, changed = mergeGames(self.season, games)
+            if changed:
+                GameTable(season)
+                self.season = season
+                self.version += 1
+        if changed:
+            self.refresh()
+        return changed
+
+    # Refresh Function
+    #
+    # Start a recompute unless one is running, in which case it runs again
+    # when done if rerun.
+
+    def refresh (self, rerun=True):
+        with self.lock:
+            if self.thread is not None:
+                self.stale = self.stale or rerun
+                return
+            self.thread = threading.Thread(target=self.recompute, daemon=True)
+            self.thread.start()
+
+    def recompute (self):
+        while True:
+            with self.lock:
+                season, version = self.season, self.version
+                self.stale = False
+
+            try:
+                result = projection.project(season, self.priorRatings, progress=Progress(stream=None), **self.options)
+                if self.record is not None:
+                    self.record(season, result)
+            except Exception as error:
+                # Keep serving the last good projection
+                with self.lock:
+                    self.error = repr(error)
+                    self.thread = None
+                raise
+
+            with self.lock:
+                self.result, self.computed, self.error = result, version, None
+                self.computedSeason = season
+                if not self.stale:
+                    self.thread = None
+                    break
+
+    # Current Function
+    #
+    # The projection to serve, None before the first one. If it was made on an
+    # earlier day, a recompute is started and, until it is done, the last
+    # projection is served with today's games rebuilt from its season.
+
+    def current (self):
+        today = datetime.date.today().strftime("%Y-%m-%d")
+        with self.lock:
+            result, season, todaysGames = self.result, self.computedSeason, self.todaysGames
+
+        if result is None or result.todaysGames['date'] == today:
+            return result
+
+        self.refresh(rerun=False)
+        if todaysGames is None or todaysGames['date'] != today:
+            state = projection.prepare(season, self.priorRatings, today)
+            todaysGames = self.todaysGames = {"date": today, "data": state.todaysGames}
+        return result._replace(todaysGames=todaysGames)
+
+    # Wait Function
+    #
+    # Block until no recompute is running.
+
+    def wait (self):
+        thread = self.thread
+        while thread is not None:
+            thread.join()
+            thread = self.thread
+
+    def status (self):
+        with self.lock:
+            return {
+                'version': self.version,
+                'computed': self.computed,
+                'computing': self.thread is not None,
+                'error': self.error,
+                'summary': self.result.summary if self.result is not None else None
+            }
+
+# Request Handler
+#
+# GET /odds       latest results snapshot, as appended to the results history
+# GET /today      today's games with win probabilities
+# GET /status     season version, version of the served odds, last run summary
+# POST /results   JSON list of games in the season file format
+
+class Handler (BaseHTTPRequestHandler):
+    def do_GET (self):
+        service = self.server.service
+
+        if self.path == "/status":
+            return self.respond(200, service.status())
+
+        result = service.current()
+        if self.path not in ["/odds", "/today"]:
+            return self.respond(404, {'error': "unknown path " + self.path})
+        if result is None:
+            return self.respond(503, {'error': "no projection yet"})
+
+        self.respond(200, result.snapshot if self.path == "/odds" else result.todaysGames)
+
+    def do_POST (self):
+        if self.path != "/results":
+            return self.respond(404, {'error': "unknown path " + self.path})
+
+        try:
+            games = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+            changed = self.server.service.ingest(games)
+        except (ValueError, KeyError, TypeError) as error:
+            return self.respond(400, {'error': str(error)})
+
+        self.respond(200, {'changed': changed, 'version': self.server.service.version})
+
+    def respond (self, code, body):
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header('Content-Type', "application/json")
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    # Unix socket clients have no address
+    def address_string (self):
+        return self.client_address[0] if self.client_address else "unix"
+
+class UnixHTTPServer (ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+# Serve Function
+#
+# Start a server for the service on a TCP port, or on a Unix socket if a path
+# is given, and return it without blocking.
+
+def serve (service, port=8000, host="127.0.0.1", socketPath=None):
+    if socketPath is not None:
+        Path(socketPath).unlink(missing_ok=True)
+        server = UnixHTTPServer(socketPath, Handler)
+    else:
+        server = ThreadingHTTPServer((host, port), Handler)
+    server.service = service
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--socket')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--iterations', type=int, default=projection.ITERATIONS)
+    parser.add_argument('--precision', type=float)
+    parser.add_argument('--time-budget', type=float)
+    parser.add_argument('--record', action='store_true')
+
+    args = parser.parse_args()
+
+    seasonPath = "./../data/season2017-18.json"
+    priorRatings = None
+
+    if Path("./../data/results2016-17.json").is_file():
+        with open("./../data/results2016-17.json") as lastSeason:
+            priorRatings = projection.carryOver(json.load(lastSeason))
+
+    # Save ingested games and each new projection like a batch run would.
+    def record (season, result):
+        saveSeason(seasonPath, season)
+        history.appendSnapshot("./../data/results2017-18", result.snapshot)
+        writeFile("./../data/today.json", json.dumps(result.todaysGames, indent=4))
+
+    # One pool of workers for the life of the service, started before any
+    # thread so workers are forked from a single-threaded process.
+    pool = Pool(args.workers) if args.workers > 1 else None
+
+    service = Service(loadSeason(seasonPath), priorRatings, {
+        'iterations': args.iterations,
+        'workers': args.workers,
+        'pool': pool,
+        'precision': args.precision,
+        'timeBudget': args.time_budget
+    }, record if args.record else None)
+
+    service.refresh()
+
+    server = serve(service, args.port, args.host, args.socket)
+    print("serving on " + (args.socket or "http://{0}:{1}".format(args.host, args.port)), flush=True)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+        if pool is not None:
+            pool.terminate()
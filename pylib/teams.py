@@ -0,0 +1,83 @@
+'''
+    Teams
+
+    2017 Jacob Grishey
+
+    For the purpose of giving every team a dense integer id
+    and keeping per-team data in arrays indexed by it.
+'''
+
+# IMPORTS
+
+import numpy
+from collections import namedtuple
+
+# Teams of the NHL
+
+METRO = ["Carolina Hurricanes", "Columbus Blue Jackets", "New Jersey Devils",
+        "New York Islanders", "New York Rangers", "Philadelphia Flyers",
+        "Pittsburgh Penguins", "Washington Capitals"]
+
+ATLANTIC = ["Boston Bruins", "Buffalo Sabres", "Detroit Red Wings",
+            "Florida Panthers", "Montréal Canadiens", "Ottawa Senators",
+            "Tampa Bay Lightning", "Toronto Maple Leafs"]
+
+CENTRAL = ["Chicago Blackhawks", "Colorado Avalanche", "Dallas Stars",
+            "Minnesota Wild", "Nashville Predators", "St. Louis Blues",
+            "Winnipeg Jets"]
+
+PACIFIC = ["Anaheim Ducks", "Arizona Coyotes", "Calgary Flames",
+            "Edmonton Oilers", "Los Angeles Kings", "San Jose Sharks",
+            "Vancouver Canucks", "Vegas Golden Knights"]
+
+# Team registry
+#
+# Ids follow the order teams have always been listed in the results files.
+
+TEAMS = METRO + ATLANTIC + CENTRAL + PACIFIC
+TEAM_IDS = {name: i for i, name in enumerate(TEAMS)}
+
+# Franchises that moved or were renamed, by their old name. Their games and
+# ratings carry over to the current team.
+
+FRANCHISES = {"Phoenix Coyotes": "Arizona Coyotes", "Atlanta Thrashers": "Winnipeg Jets"}
+
+def franchise (name):
+    return FRANCHISES.get(name, name)
+
+# Divisions as lists of team ids, in bracket order.
+
+ATLANTIC_IDS = [TEAM_IDS[name] for name in ATLANTIC]
+CENTRAL_IDS = [TEAM_IDS[name] for name in CENTRAL]
+METRO_IDS = [TEAM_IDS[name] for name in METRO]
+PACIFIC_IDS = [TEAM_IDS[name] for name in PACIFIC]
+
+DIVISION_NAMES = (["Metropolitan"] * len(METRO) + ["Atlantic"] * len(ATLANTIC)
+                    + ["Central"] * len(CENTRAL) + ["Pacific"] * len(PACIFIC))
+
+# Results counted over simulations
+
+RESULT_KEYS = ['aw', 'al', 'aotl', 'd1', 'd2', 'd3', 'wc1', 'wc2', 'pres', 'conf', 'r2', 'r3', 'r4', 'cup']
+
+# Team Table
+#
+# Elo ratings and records of every team, one array each, indexed by team id.
+
+TeamTable = namedtuple('TeamTable', ['elo', 'w', 'l', 'otl', 'row'])
+
+def newTable (elo=1500):
+    return TeamTable(numpy.full(len(TEAMS), elo, dtype=float),
+                        *[numpy.zeros(len(TEAMS), dtype=numpy.int64) for i in range(4)])
+
+def copyTable (table):
+    return TeamTable(*[column.copy() for column in table])
+
+# New Counters Function
+#
+# Counts of every result as one matrix, a row per team id and a column per
+# result, in the order of RESULT_KEYS.
+
+RESULT_COLUMNS = {key: column for column, key in enumerate(RESULT_KEYS)}
+
+def newCounters ():
+    return numpy.zeros((len(TEAMS), len(RESULT_KEYS)), dtype=numpy.int64)
@@ -0,0 +1,63 @@
+'''
+    API Response Cache Tests
+
+    2017 Jacob Grishey
+
+    For the purpose of checking when cached responses are
+    reused, refetched or refused.
+'''
+
+# IMPORTS
+
+import json
+import datetime
+import pytest
+from apicache import ResponseCache, CacheMiss
+
+URL = "http://api.example/schedule?startDate=2017-10-04&endDate=2017-10-10"
+
+def timestamp (date):
+    return datetime.datetime.fromisoformat(date + "T12:00:00").timestamp()
+
+def entry (fetched):
+    return {'url': URL, 'object': "", 'fetched': timestamp(fetched)}
+
+def testSettledResponsesKeptForGood ():
+    cache = ResponseCache("unused")
+    now = timestamp("2018-06-01")
+    assert cache.fresh(entry("2017-10-12"), "2017-10-10", now)
+    assert not cache.fresh(entry("2017-10-11"), "2017-10-10", now)
+
+def testRecentResponsesExpire ():
+    cache = ResponseCache("unused", ttl=900)
+    fetched = entry("2017-10-11")
+    assert cache.fresh(fetched, "2017-10-10", fetched['fetched'] + 899)
+    assert not cache.fresh(fetched, "2017-10-10", fetched['fetched'] + 901)
+
+def testGetStoresAndReuses (tmp_path):
+    cache = ResponseCache(tmp_path)
+    downloads = []
+
+    def download ():
+        downloads.append(URL)
+        return json.dumps({'dates': []}).encode()
+
+    assert cache.get(URL, "2099-01-01", download) == {'dates': []}
+    assert cache.get(URL, "2099-01-01", download) == {'dates': []}
+    assert len(downloads) == 1
+
+def testOffline (tmp_path):
+    ResponseCache(tmp_path).write(URL, b'{"dates": []}')
+    offline = ResponseCache(tmp_path, ttl=0, offline=True)
+
+    assert offline.get(URL, "2099-01-01", None) == {'dates': []}
+    with pytest.raises(CacheMiss):
+        offline.get(URL + "&other", "2099-01-01", None)
+
+def testDamagedBodyIgnored (tmp_path):
+    cache = ResponseCache(tmp_path)
+    cache.write(URL, b'{"dates": []}')
+    stored, body = cache.read(URL)
+    cache.objectPath(stored['object']).write_bytes(b'{"dates": [1]}')
+
+    assert cache.read(URL) == (None, None)
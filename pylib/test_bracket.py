@@ -0,0 +1,99 @@
+'''
+    Playoff Bracket Tests
+
+    2017 Jacob Grishey
+
+    For the purpose of checking the array seeding against
+    plain sorts of the standings.
+'''
+
+# IMPORTS
+
+import numpy
+from bracket import seedBatch, seedPlayoffs, conferencePlaces
+from teams import TEAMS, ATLANTIC_IDS, CENTRAL_IDS, METRO_IDS, PACIFIC_IDS
+
+# Reference Seeding Function
+#
+# Seed one simulation with stable sorts on points then ROW, teams tied on both
+# keeping the order they are listed in. Division winners take part in the
+# wild card assignment in their conference order.
+
+def referenceSeeding (pts, row):
+    def rank (ids):
+        return sorted(ids, key=lambda team: (pts[team], row[team]), reverse=True)
+
+    atlantic, central, metro, pacific = [rank(division) for division in [ATLANTIC_IDS, CENTRAL_IDS, METRO_IDS, PACIFIC_IDS]]
+    west = rank(central + pacific)
+    east = rank(atlantic + metro)
+    league = rank(west + east)
+    wildCardsEast = rank(metro[3:] + atlantic[3:])[:2]
+    wildCardsWest = rank(pacific[3:] + central[3:])[:2]
+
+    brackets = [atlantic[:3], central[:3], metro[:3], pacific[:3]]
+    seeding = {'d{0}'.format(i): [division[i-1] for division in brackets] for i in range(1, 4)}
+    seeding.update({
+        'wc1': [wildCardsEast[0], wildCardsWest[0]],
+        'wc2': [wildCardsEast[1], wildCardsWest[1]],
+        'pres': [league[0]],
+        'conf': [west[0], east[0]]
+    })
+
+    for first, second, wildCards, conference in [(2, 0, wildCardsEast, east), (1, 3, wildCardsWest, west)]:
+        if brackets[first][0] == conference[0]:
+            brackets[first].append(wildCards[1])
+            brackets[second].append(wildCards[0])
+        else:
+            brackets[first].append(wildCards[0])
+            brackets[second].append(wildCards[1])
+
+    return brackets, seeding
+
+# Tied Standings Function
+#
+# Random standings of a batch of simulations over so few values that most
+# teams share their points, and many their ROW too.
+
+def tiedStandings (simulations, seed):
+    rng = numpy.random.default_rng(seed)
+    pts = rng.integers(90, 94, (simulations, len(TEAMS)))
+    row = rng.integers(38, 40, (simulations, len(TEAMS)))
+    return pts, row
+
+def testSeedBatchMatchesSorts ():
+    pts, row = tiedStandings(5000, 1)
+    brackets, seeding = seedBatch(pts, row)
+
+    for i in range(len(pts)):
+        expectedBrackets, expectedSeeding = referenceSeeding(pts[i].tolist(), row[i].tolist())
+        assert brackets[i].tolist() == expectedBrackets
+        for result, teams in expectedSeeding.items():
+            assert seeding[result][i].tolist() == teams, result
+
+def testSeedPlayoffsMatchesSorts ():
+    pts, row = tiedStandings(200, 2)
+
+    for i in range(len(pts)):
+        assert seedPlayoffs(pts[i].tolist(), row[i].tolist()) == referenceSeeding(pts[i].tolist(), row[i].tolist())
+
+def testTiedDivisionWinners ():
+    # Every team level, so the conference order alone decides: the Atlantic
+    # winner leads the East and the Central winner the West.
+    pts = [[90] * len(TEAMS)]
+    row = [[38] * len(TEAMS)]
+    brackets, seeding = seedBatch(pts, row)
+
+    assert seeding['conf'][0].tolist() == [CENTRAL_IDS[0], ATLANTIC_IDS[0]]
+    assert brackets[0, 0, 3] == seeding['wc2'][0, 0]
+    assert brackets[0, 2, 3] == seeding['wc1'][0, 0]
+    assert brackets[0, 1, 3] == seeding['wc2'][0, 1]
+    assert brackets[0, 3, 3] == seeding['wc1'][0, 1]
+
+def testConferencePlacesMatchSorts ():
+    pts, row = tiedStandings(500, 3)
+    places = conferencePlaces(pts, row)
+
+    for i in range(len(pts)):
+        for conference in [ATLANTIC_IDS + METRO_IDS, CENTRAL_IDS + PACIFIC_IDS]:
+            ranked = sorted(conference, key=lambda team: (pts[i, team], row[i, team]), reverse=True)
+            assert [int(places[i, team]) for team in ranked] == list(range(1, len(conference) + 1))
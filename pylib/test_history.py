@@ -0,0 +1,53 @@
+'''
+    Results History Tests
+
+    2017 Jacob Grishey
+
+    For the purpose of checking that the history survives
+    a crash partway through an append.
+'''
+
+# IMPORTS
+
+import json
+import history
+
+def snapshot (date):
+    return {'date': date, 'playoffs': False, 'results': [{'name': "Team", 'elo': 1500.0}]}
+
+def testAppendAndRead (tmp_path):
+    base = tmp_path / "results"
+    for date in ["2017-10-04", "2017-10-05", "2017-10-05"]:
+        history.appendSnapshot(base, snapshot(date))
+
+    assert [entry[0] for entry in history.readIndex(base)] == ["2017-10-04", "2017-10-05", "2017-10-05"]
+    assert history.readSnapshot(base, "2017-10-05") == snapshot("2017-10-05")
+    assert history.readSnapshot(base, "2017-10-06") is None
+
+def testTornLineRecovery (tmp_path):
+    base = tmp_path / "results"
+    history.appendSnapshot(base, snapshot("2017-10-04"))
+
+    # A crash after writing a whole snapshot but before indexing it, then one
+    # partway through writing the next line.
+    with open(history.snapshotsPath(base), "ab") as snapshotFile:
+        snapshotFile.write((json.dumps(snapshot("2017-10-05")) + "\n").encode())
+        snapshotFile.write(json.dumps(snapshot("2017-10-06")).encode()[:20])
+
+    history.appendSnapshot(base, snapshot("2017-10-07"))
+
+    dates = ["2017-10-04", "2017-10-05", "2017-10-07"]
+    assert history.readSnapshots(base) == [snapshot(date) for date in dates]
+    assert [entry[0] for entry in history.readIndex(base)] == dates
+    lines = history.snapshotsPath(base).read_bytes().splitlines()
+    assert [json.loads(line)['date'] for line in lines] == dates
+
+def testImportAndExportArray (tmp_path):
+    base = tmp_path / "results"
+    history.arrayPath(base).write_text(json.dumps([snapshot("2017-10-04")]))
+
+    history.appendSnapshot(base, snapshot("2017-10-05"))
+    history.exportArray(base)
+
+    with open(history.arrayPath(base)) as arrayFile:
+        assert json.load(arrayFile) == [snapshot("2017-10-04"), snapshot("2017-10-05")]
@@ -0,0 +1,35 @@
+'''
+    Projection Tests
+
+    2017 Jacob Grishey
+
+    For the purpose of checking that a seeded projection
+    is the same however many workers run it.
+'''
+
+# IMPORTS
+
+from pathlib import Path
+import projection
+from season import loadSeason
+
+DATA_DIR = Path(__file__).parent / ".." / "data"
+
+# Cut Season Function
+#
+# The 2017-18 season with every result from date on taken back, so the rest of
+# the regular season and the playoffs are simulated.
+
+def cutSeason (date):
+    season = loadSeason(DATA_DIR / "season2017-18.json")
+    return [dict(game, resultType="TBD", homeGoals=0, awayGoals=0) if game['date'] >= date else game
+            for game in season]
+
+def testWorkerCountsAgree ():
+    season = cutSeason("2018-02-01")
+    runs = [projection.project(season, iterations=3 * projection.BATCH_SIZE + 17, seed=7, workers=workers,
+                                today="2018-02-01")
+            for workers in [1, 3]]
+
+    assert runs[0].snapshot == runs[1].snapshot
+    assert runs[0].todaysGames == runs[1].todaysGames
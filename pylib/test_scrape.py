@@ -0,0 +1,54 @@
+'''
+    Scraper Tests
+
+    2017 Jacob Grishey
+
+    For the purpose of checking the incremental scrape
+    offline, against a recorded schedule response.
+'''
+
+# IMPORTS
+
+from pathlib import Path
+from scrape import fixtureSchedule, getGames, updateSeason
+from season import loadSeason
+
+HERE = Path(__file__).parent
+
+# The end of the 2016-17 regular season and the first playoff games, recorded
+# with fakeapi.py --record 2016-17 --dfrom 2017-04-08 --dto 2017-04-13.
+
+FIXTURE = HERE / "fixtures" / "schedule2016-17.json"
+LAST_DATE = "2017-04-13"
+
+def seasonFile ():
+    return [game for game in loadSeason(HERE / ".." / "data" / "season2016-17.json") if game['gameType'] != "A"]
+
+def scheduled (game):
+    return dict(game, resultType="TBD", homeGoals=0, awayGoals=0)
+
+def testFixtureMatchesSeasonFile ():
+    games = getGames("2017-04-09", "2017-04-12", fixtureSchedule(FIXTURE))
+    assert games == [game for game in seasonFile() if "2017-04-09" <= game['date'] <= "2017-04-12"]
+
+def testUpdateSeason ():
+    # Scraped on the morning of 2017-04-08: that day's games still scheduled,
+    # and one game on the schedule then that was later taken off it.
+    stray = {'date': "2017-04-10", 'gameType': "R", 'resultType': "TBD", 'homeTeam': "Boston Bruins",
+                'awayTeam': "Toronto Maple Leafs", 'homeGoals': 0, 'awayGoals': 0}
+    season = ([game for game in seasonFile() if game['date'] < "2017-04-08"] +
+                [scheduled(game) for game in seasonFile() if game['date'] == "2017-04-08"] + [stray])
+
+    updated, changed = updateSeason(season, fetch=fixtureSchedule(FIXTURE))
+
+    expected = [game for game in seasonFile() if game['date'] <= LAST_DATE]
+    assert updated == expected
+    assert stray not in updated
+    assert len([game for game in updated if game['gameType'] == "P"]) == 8
+
+    fetched = [game for game in expected if game['date'] >= "2017-04-08"]
+    assert changed == len(fetched) + 1
+
+def testUpdateSeasonUpToDate ():
+    season = [game for game in seasonFile() if game['date'] <= LAST_DATE]
+    assert updateSeason(season, fetch=fixtureSchedule(FIXTURE)) == (season, 0)
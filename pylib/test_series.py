@@ -0,0 +1,55 @@
+'''
+    Series Probability Tests
+
+    2017 Jacob Grishey
+
+    For the purpose of checking the series dynamic program
+    against probabilities worked out by hand.
+'''
+
+# IMPORTS
+
+import itertools
+import pytest
+from series import OUTCOMES, seriesOutcomes, seriesWinProbability
+from vecsim import expectedScores
+
+RATINGS = [(1500.0, 1500.0), (1620.5, 1480.25), (1400.0, 1700.0)]
+SCORES = [(h, a) for h in range(4) for a in range(4)]
+
+# Enumerate Outcomes Function
+#
+# Probability of each outcome by playing out every sequence of the remaining
+# games, all seven even past a decided series, and keeping the score at which
+# the series was decided.
+
+def enumerateOutcomes (eloHigh, eloLow, hWins, aWins):
+    p = float(expectedScores(eloHigh, eloLow))
+    probs = dict.fromkeys(OUTCOMES, 0.0)
+
+    for games in itertools.product([True, False], repeat=7 - hWins - aWins):
+        h, a, prob = hWins, aWins, 1.0
+        for highWon in games:
+            prob *= p if highWon else 1 - p
+            if h < 4 and a < 4:
+                h, a = (h + 1, a) if highWon else (h, a + 1)
+        probs[(h, a)] += prob
+
+    return tuple(probs[outcome] for outcome in OUTCOMES)
+
+@pytest.mark.parametrize('eloHigh, eloLow', RATINGS)
+@pytest.mark.parametrize('hWins, aWins', SCORES)
+def testOutcomesSumToOne (eloHigh, eloLow, hWins, aWins):
+    assert sum(seriesOutcomes(eloHigh, eloLow, hWins, aWins)) == pytest.approx(1.0)
+
+@pytest.mark.parametrize('eloHigh, eloLow', RATINGS)
+@pytest.mark.parametrize('hWins, aWins', SCORES)
+def testOutcomesMatchEnumeration (eloHigh, eloLow, hWins, aWins):
+    assert seriesOutcomes(eloHigh, eloLow, hWins, aWins) == pytest.approx(enumerateOutcomes(eloHigh, eloLow, hWins, aWins))
+
+def testEvenSeries ():
+    assert seriesOutcomes(1500.0, 1500.0)[0] == pytest.approx(1 / 16)
+    assert seriesWinProbability(1500.0, 1500.0) == pytest.approx(0.5)
+
+def testGameSeven ():
+    assert seriesWinProbability(1600.0, 1500.0, 3, 3) == pytest.approx(float(expectedScores(1600.0, 1500.0)))
@@ -0,0 +1,70 @@
+'''
+    Vectorized Season Simulation
+
+    2017 Jacob Grishey
+
+    For the purpose of simulating the remaining regular season
+    for a whole batch of simulations at once.
+'''
+
+# IMPORTS
+
+import numpy
+
+# Overtime model
+#
+# Share of games that go past regulation, and share of those decided in a
+# shootout.
+
+OT_RATE = 0.233
+SO_RATE = 0.579
+
+# Expected Score function
+#
+# Same as expectedScoreA in projection.py, but works on whole arrays of ratings.
+
+def expectedScores (eloA, eloB):
+    return 1 / (1 + 10 ** ((numpy.asarray(eloB) - numpy.asarray(eloA)) / 400))
+
+# Tally Function
+#
+# Scatter-add one outcome into a (simulations x teams) table, given which
+# simulations/games the home and away team got that outcome in.
+
+def tally (homeSlots, awaySlots, homeMask, awayMask, shape):
+    slots = numpy.concatenate((homeSlots[homeMask.ravel()], awaySlots[awayMask.ravel()]))
+    return numpy.bincount(slots, minlength=shape[0] * shape[1]).reshape(shape)
+
+# Simulate Regular Season Function
+#
+# Given the home/away team indices and home win probabilities of the remaining
+# games, draw every game of numSims simulations at once. Returns the wins,
+# losses, overtime losses and regulation/overtime wins each team adds to
+# its record, as (numSims x numTeams) arrays.
+
+def simRegularSeason (homeIdx, awayIdx, homeProb, numTeams, numSims, rng=numpy.random):
+    homeIdx = numpy.asarray(homeIdx, dtype=numpy.intp)
+    awayIdx = numpy.asarray(awayIdx, dtype=numpy.intp)
+    shape = (numSims, numTeams)
+
+    # Random numbers deciding the winner, overtime and shootout of every game.
+    decideWin = rng.random((numSims, len(homeIdx)))
+    decideOT = rng.random((numSims, len(homeIdx)))
+    decideSO = rng.random((numSims, len(homeIdx)))
+
+    homeWin = decideWin <= homeProb
+    awayWin = ~homeWin
+    overtime = decideOT <= OT_RATE
+    shootout = overtime & (decideSO <= SO_RATE)
+
+    # Flat (simulation, team) slot of both teams of every game.
+    offsets = numpy.arange(numSims, dtype=numpy.intp)[:, None] * numTeams
+    homeSlots = (offsets + homeIdx).ravel()
+    awaySlots = (offsets + awayIdx).ravel()
+
+    w = tally(homeSlots, awaySlots, homeWin, awayWin, shape)
+    l = tally(homeSlots, awaySlots, awayWin & ~overtime, homeWin & ~overtime, shape)
+    otl = tally(homeSlots, awaySlots, awayWin & overtime, homeWin & overtime, shape)
+    row = tally(homeSlots, awaySlots, homeWin & ~shootout, awayWin & ~shootout, shape)
+
+    return w, l, otl, row